@@ -1,2 +1,13 @@
-from .sync import BunnySync
-from .bunny_client import BunnyClient
+__all__ = ["BunnySync", "BunnyClient"]
+
+
+def __getattr__(name):
+    # Resolve the public classes on first access so that CLI entry points
+    # (e.g. --help, bunny-dns-check) don't pay for importing requests
+    if name == "BunnySync":
+        from .sync import BunnySync
+        return BunnySync
+    if name == "BunnyClient":
+        from .bunny_client import BunnyClient
+        return BunnyClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
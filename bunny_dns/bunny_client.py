@@ -2,10 +2,20 @@
 Low-level HTTP client for bunny.net API.
 """
 
+import copy
+import random
+import threading
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import jsonlib
+from .concurrency import DEFAULT_MAX_WORKERS
 
 
 class BunnyAPIError(Exception):
@@ -34,7 +44,16 @@ class BunnyNotFoundError(BunnyAPIError):
 
 class BunnyRateLimitError(BunnyAPIError):
     """Rate limit exceeded (429)."""
-    pass
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        response: Optional[dict] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message, status_code=status_code, response=response)
+        self.retry_after = retry_after
 
 
 class BunnyValidationError(BunnyAPIError):
@@ -42,37 +61,125 @@ class BunnyValidationError(BunnyAPIError):
     pass
 
 
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+# (connect, read) timeouts in seconds; fail fast on unreachable hosts
+# but allow slow responses for large zone listings
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Gateway errors worth retrying at the connection-pool level. 429 is left
+# to _request so Retry-After and the configured backoff apply.
+TRANSIENT_STATUS_CODES = (502, 503, 504)
+
+
 class BunnyClient:
     """HTTP client for bunny.net API with AccessKey authentication."""
 
     BASE_URL = "https://api.bunny.net"
 
-    def __init__(self, api_key: str, max_retries: int = 3, retry_delay: float = 1.0):
+    def __init__(
+        self,
+        api_key: str,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        pool_size: int = 32,
+        cache_ttl: float = 0.0,
+        max_retry_delay: float = 60.0,
+        timeout: tuple[float, float] = DEFAULT_TIMEOUT,
+        session: Optional[requests.Session] = None,
+        max_concurrent_requests: int = DEFAULT_MAX_WORKERS,
+    ):
         """
         Initialize the Bunny API client.
 
+        The client is safe to share between threads: managers fan out
+        independent API calls concurrently over its keep-alive pool.
+
         Args:
             api_key: Your bunny.net API key (AccessKey)
-            max_retries: Maximum number of retries for rate-limited requests
+            max_retries: Maximum number of retries for rate-limited requests,
+                and for connection errors and 502/503/504 responses
             retry_delay: Base delay between retries (exponential backoff)
+            pool_size: Maximum number of pooled keep-alive connections
+            cache_ttl: Seconds to reuse GET responses (0, the default,
+                disables caching)
+            max_retry_delay: Upper bound on a single retry wait, including
+                server-supplied Retry-After values
+            timeout: (connect, read) timeouts in seconds for each request
+            session: Session to send requests through instead of a new
+                pooled one; its adapters are used as they are
+            max_concurrent_requests: Most requests in flight at once across
+                all threads, however deeply the managers' thread pools nest
         """
         self.api_key = api_key
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.session = requests.Session()
+        self.max_retry_delay = max_retry_delay
+        self.timeout = timeout
+        # Nested fan-outs (domains, then zones, then records) share this
+        # client; the cap keeps them within the connection pool and clear
+        # of bursts of 429s
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+        self.cache_ttl = cache_ttl
+        self._cache: dict[tuple, tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+        # Bumped by every invalidation; a GET only stores its response if no
+        # invalidation happened while it was in flight
+        self._cache_generation = 0
+        if session is None:
+            session = requests.Session()
+            # Connection failures and gateway errors are retried by urllib3;
+            # idempotent methods only, so a POST is never sent twice
+            transport_retry = Retry(
+                total=max_retries,
+                backoff_factor=0.3,
+                status_forcelist=TRANSIENT_STATUS_CODES,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=pool_size, max_retries=transport_retry
+            )
+            session.mount("https://", adapter)
+        self.session = session
         self.session.headers.update({
             "AccessKey": api_key,
             "Content-Type": "application/json",
             "Accept": "application/json",
         })
 
+    def close(self) -> None:
+        """Close pooled connections and drop cached responses."""
+        self.session.close()
+        self.clear_cache()
+
+    def __enter__(self) -> "BunnyClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def _handle_response(self, response: requests.Response) -> Any:
         """Handle API response and raise appropriate exceptions."""
         status_code = response.status_code
 
-        # Try to parse JSON response
+        # Try to parse JSON response straight from the raw bytes
         try:
-            data = response.json() if response.text else None
+            data = jsonlib.loads(response.content) if response.content else None
         except ValueError:
             data = None
 
@@ -109,6 +216,7 @@ class BunnyClient:
                 "Rate limit exceeded",
                 status_code=status_code,
                 response=data,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
             )
         else:
             raise BunnyAPIError(
@@ -140,32 +248,105 @@ class BunnyClient:
 
         for attempt in range(self.max_retries + 1):
             try:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json_data,
-                )
+                with self._request_slots:
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        json=json_data,
+                        timeout=self.timeout,
+                    )
                 return self._handle_response(response)
-            except BunnyRateLimitError:
+            except BunnyRateLimitError as e:
                 if attempt < self.max_retries:
-                    delay = self.retry_delay * (2 ** attempt)
+                    # Prefer the server's hint; jitter spreads out concurrent retries
+                    if e.retry_after is not None:
+                        delay = e.retry_after
+                    else:
+                        delay = self.retry_delay * (2 ** attempt)
+                    delay = min(delay, self.max_retry_delay) + random.uniform(0, 0.1)
                     time.sleep(delay)
                 else:
                     raise
 
-    def get(self, endpoint: str, params: Optional[dict] = None) -> Any:
-        """Make a GET request."""
-        return self._request("GET", endpoint, params=params)
+    @staticmethod
+    def _cache_key(endpoint: str, params: Optional[dict]) -> tuple:
+        return (endpoint, frozenset(params.items()) if params else None)
+
+    def invalidate(self, endpoint: str) -> None:
+        """
+        Drop cached GET responses affected by a change to endpoint.
+
+        A change to "/dnszone/1/records" invalidates "/dnszone" and
+        "/dnszone/1" (parents) as well as anything below the endpoint itself.
+        """
+        with self._cache_lock:
+            self._cache_generation += 1
+            for key in list(self._cache):
+                cached = key[0]
+                if (
+                    cached == endpoint
+                    or endpoint.startswith(cached + "/")
+                    or cached.startswith(endpoint + "/")
+                ):
+                    del self._cache[key]
+
+    def clear_cache(self) -> None:
+        """Drop all cached GET responses."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._cache.clear()
+
+    def get(self, endpoint: str, params: Optional[dict] = None, cache: bool = True) -> Any:
+        """
+        Make a GET request, reusing a cached response for up to cache_ttl seconds.
+
+        Each call gets its own copy of the data, so callers may modify it
+        without affecting the cache or each other.
+
+        Pass cache=False for GET endpoints with side effects (e.g. loading a
+        certificate); their path is invalidated like any other mutation.
+        """
+        if not cache:
+            try:
+                return self._request("GET", endpoint, params=params)
+            finally:
+                self.invalidate(endpoint)
+
+        if self.cache_ttl <= 0:
+            return self._request("GET", endpoint, params=params)
+
+        key = self._cache_key(endpoint, params)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            generation = self._cache_generation
+        if entry is not None and entry[0] > time.monotonic():
+            return copy.deepcopy(entry[1])
+
+        data = self._request("GET", endpoint, params=params)
+        with self._cache_lock:
+            # A write that landed mid-fetch may have made data stale
+            if self._cache_generation == generation:
+                self._cache[key] = (time.monotonic() + self.cache_ttl, data)
+        return copy.deepcopy(data)
 
     def post(self, endpoint: str, data: Optional[dict] = None) -> Any:
         """Make a POST request."""
-        return self._request("POST", endpoint, json_data=data)
+        try:
+            return self._request("POST", endpoint, json_data=data)
+        finally:
+            self.invalidate(endpoint)
 
     def put(self, endpoint: str, data: Optional[dict] = None) -> Any:
         """Make a PUT request."""
-        return self._request("PUT", endpoint, json_data=data)
+        try:
+            return self._request("PUT", endpoint, json_data=data)
+        finally:
+            self.invalidate(endpoint)
 
     def delete(self, endpoint: str, params: Optional[dict] = None) -> Any:
         """Make a DELETE request."""
-        return self._request("DELETE", endpoint, params=params)
+        try:
+            return self._request("DELETE", endpoint, params=params)
+        finally:
+            self.invalidate(endpoint)
@@ -5,52 +5,185 @@ Check DNS propagation status for domains configured with bunny.net.
 Usage:
     python check_propagation.py example.com
     python check_propagation.py example.com --config config.json
+    python check_propagation.py example.com example.org
 """
 
 import argparse
+import http.client
 import json
 import ssl
-import subprocess
 import sys
-from urllib.request import Request, urlopen
+import threading
+from functools import partial
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
 
+import dns.exception
+import dns.resolver
 
-BUNNY_NAMESERVERS = {"kiki.bunny.net", "coco.bunny.net"}
+from .concurrency import run_concurrently
 
 
-def run_dig(query_type: str, domain: str) -> list[str]:
-    """Run dig command and return results."""
+BUNNY_NAMESERVERS = frozenset({"kiki.bunny.net", "coco.bunny.net"})
+
+# Overall time budget for one DNS lookup, and the wait per nameserver
+# attempt within it, so a stalled server cannot hold up the whole check
+DEFAULT_DNS_TIMEOUT = 3.0
+DNS_SERVER_TIMEOUT = 2.0
+
+# Maximum number of answers kept by the shared resolver's cache
+RESOLVER_CACHE_SIZE = 10_000
+
+_resolver: Optional[dns.resolver.Resolver] = None
+
+# Loading the CA bundle is expensive, so the TLS context is built on the first
+# HTTPS probe and shared by the rest (SSLContext is safe to share between threads)
+_ssl_context: Optional[ssl.SSLContext] = None
+_ssl_context_lock = threading.Lock()
+
+# Idle keep-alive connections by (scheme, host, port), shared by every check
+# in the process so repeated checks of a host skip the TCP/TLS handshake
+_https_idle: dict[tuple[str, str, Optional[int]], list[http.client.HTTPConnection]] = {}
+_https_lock = threading.Lock()
+
+# Idle connections kept per host; extra ones are closed on release
+MAX_IDLE_PER_HOST = 4
+
+# Redirects followed before giving up, the same limit urllib applies
+MAX_REDIRECTS = 10
+REDIRECT_STATUS_CODES = frozenset({301, 302, 303, 307, 308})
+
+
+def get_resolver() -> dns.resolver.Resolver:
+    """Return the process-wide resolver, creating it on first use.
+
+    The resolver keeps a TTL-honoring answer cache, so checking many
+    domains in one process does not repeat identical upstream queries.
+    """
+    global _resolver
+    if _resolver is None:
+        _resolver = dns.resolver.Resolver()
+        _resolver.timeout = DNS_SERVER_TIMEOUT
+        _resolver.cache = dns.resolver.LRUCache(max_size=RESOLVER_CACHE_SIZE)
+    return _resolver
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """Return the process-wide TLS context, creating it on first use."""
+    global _ssl_context
+    with _ssl_context_lock:
+        if _ssl_context is None:
+            _ssl_context = ssl.create_default_context()
+            _ssl_context.check_hostname = True
+    return _ssl_context
+
+
+def run_dig(query_type: str, domain: str, timeout: float = DEFAULT_DNS_TIMEOUT) -> list[str]:
+    """Resolve a record in-process and return results like `dig +short`."""
     try:
-        result = subprocess.run(
-            ["dig", query_type, domain, "+short"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        lines = result.stdout.strip().split("\n")
-        return [line.strip().rstrip(".") for line in lines if line.strip()]
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+        answer = get_resolver().resolve(domain, query_type, lifetime=timeout)
+    except dns.exception.DNSException:
         return []
+    return [str(rdata).rstrip(".") for rdata in answer]
+
+
+def _acquire_https(
+    scheme: str, host: str, port: Optional[int]
+) -> tuple[http.client.HTTPConnection, bool]:
+    """Take an idle keep-alive connection to host, or open a new one.
+
+    Returns:
+        The connection and whether it was reused from the pool
+    """
+    with _https_lock:
+        idle = _https_idle.get((scheme, host, port))
+        if idle:
+            return idle.pop(), True
+    if scheme == "http":
+        return http.client.HTTPConnection(host, port, timeout=10), False
+    return http.client.HTTPSConnection(host, port, timeout=10, context=get_ssl_context()), False
+
+
+def _release_https(
+    scheme: str, host: str, port: Optional[int], conn: http.client.HTTPConnection
+) -> None:
+    """Return a connection to the pool for later checks of the same host."""
+    with _https_lock:
+        idle = _https_idle.setdefault((scheme, host, port), [])
+        if len(idle) < MAX_IDLE_PER_HOST:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def close_idle_connections() -> None:
+    """Close every pooled keep-alive connection."""
+    with _https_lock:
+        idle = [conn for conns in _https_idle.values() for conn in conns]
+        _https_idle.clear()
+    for conn in idle:
+        conn.close()
+
+
+def _head(scheme: str, host: str, port: Optional[int], path: str) -> http.client.HTTPResponse:
+    """Send a HEAD request over a pooled connection and return the response."""
+    while True:
+        conn, reused = _acquire_https(scheme, host, port)
+        try:
+            conn.request("HEAD", path, headers={"User-Agent": "bunny-dns/1.0"})
+            response = conn.getresponse()
+            response.read()
+        except ConnectionError:
+            conn.close()
+            if reused:
+                # The server dropped the idle connection; retry on a fresh one
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            _release_https(scheme, host, port, conn)
+        return response
 
 
 def check_https(hostname: str) -> dict:
-    """Check if HTTPS is working for a hostname."""
+    """Check if HTTPS is working for a hostname.
+
+    Redirects are followed (up to MAX_REDIRECTS) and the final response
+    is reported.
+    """
+    url = f"https://{hostname}/"
     try:
-        ctx = ssl.create_default_context()
-        req = Request(
-            f"https://{hostname}",
-            method="HEAD",
-            headers={"User-Agent": "bunny-dns/1.0"}
-        )
-        with urlopen(req, timeout=10, context=ctx) as response:
-            return {"status": "ok", "code": response.status}
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            path = parts.path or "/"
+            if parts.query:
+                path += f"?{parts.query}"
+            # hostname and port leave out any user:pass@ in a redirect target
+            response = _head(parts.scheme, parts.hostname, parts.port, path)
+            location = response.getheader("Location")
+            if response.status not in REDIRECT_STATUS_CODES or not location:
+                break
+            url = urljoin(url, location)
+            if urlsplit(url).scheme not in ("http", "https"):
+                return {"status": "error", "error": f"Unsupported redirect to {url}"}
+        else:
+            return {"status": "error", "error": f"HTTP Error {response.status}: too many redirects"}
     except ssl.SSLError as e:
         return {"status": "ssl_error", "error": str(e)}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
+    if response.status >= 400:
+        return {"status": "error", "error": f"HTTP Error {response.status}: {response.reason}"}
+    return {"status": "ok", "code": response.status}
+
 
-def check_domain(domain: str, config: dict = None) -> dict:
+def check_domain(domain: str, config: dict = None, timeout: float = DEFAULT_DNS_TIMEOUT) -> dict:
     """Check propagation status for a domain."""
     results = {
         "domain": domain,
@@ -59,21 +192,50 @@ def check_domain(domain: str, config: dict = None) -> dict:
         "hostnames": [],
     }
 
+    www = f"www.{domain}"
+    queries = [
+        ("NS", domain),
+        ("A", domain),
+        ("AAAA", domain),
+        ("MX", domain),
+        ("CNAME", www),
+        ("A", www),
+    ]
+
+    # Pull zone hostnames from config get a CNAME lookup and an HTTPS probe
+    targets = []
+    if config:
+        domain_config = config.get("domains", {}).get(domain, {})
+        targets = [
+            (zone_name, hostname)
+            for zone_name, zone_config in domain_config.get("pull_zones", {}).items()
+            for hostname in zone_config.get("hostnames", [])
+        ]
+    queries += [("CNAME", hostname) for _, hostname in targets]
+
+    # None of the lookups depend on each other - issue them all at once
+    calls = [partial(run_dig, qtype, name, timeout) for qtype, name in queries]
+    calls += [partial(check_https, hostname) for _, hostname in targets]
+    outcomes = run_concurrently(lambda call: call(), calls, max_workers=16)
+    answers = dict(zip(queries, outcomes))
+    https_results = outcomes[len(queries):]
+
     # Check nameservers
-    ns_records = run_dig("NS", domain)
-    ns_lower = {ns.lower() for ns in ns_records}
+    ns_records = answers[("NS", domain)]
     results["nameservers"]["current"] = ns_records
 
-    if ns_lower == BUNNY_NAMESERVERS:
+    # An NS answer never repeats a name, so counting hits is enough
+    hits = sum(1 for ns in ns_records if ns.lower() in BUNNY_NAMESERVERS)
+    if hits == len(BUNNY_NAMESERVERS) == len(ns_records):
         results["nameservers"]["status"] = "ok"
-    elif ns_lower & BUNNY_NAMESERVERS:
+    elif hits:
         results["nameservers"]["status"] = "partial"
     else:
         results["nameservers"]["status"] = "not_bunny"
 
     # Check some basic records
     for record_type in ["A", "AAAA", "MX"]:
-        values = run_dig(record_type, domain)
+        values = answers[(record_type, domain)]
         if values:
             results["records"].append({
                 "type": record_type,
@@ -83,9 +245,7 @@ def check_domain(domain: str, config: dict = None) -> dict:
             })
 
     # Check www
-    www_values = run_dig("CNAME", f"www.{domain}")
-    if not www_values:
-        www_values = run_dig("A", f"www.{domain}")
+    www_values = answers[("CNAME", www)] or answers[("A", www)]
     if www_values:
         results["records"].append({
             "type": "CNAME/A",
@@ -94,21 +254,15 @@ def check_domain(domain: str, config: dict = None) -> dict:
             "status": "resolving"
         })
 
-    # If config provided, check pull zone hostnames
-    if config:
-        domain_config = config.get("domains", {}).get(domain, {})
-        for zone_name, zone_config in domain_config.get("pull_zones", {}).items():
-            for hostname in zone_config.get("hostnames", []):
-                cname_values = run_dig("CNAME", hostname)
-                https_result = check_https(hostname)
-
-                results["hostnames"].append({
-                    "hostname": hostname,
-                    "zone": zone_name,
-                    "cname": cname_values[0] if cname_values else None,
-                    "ssl": https_result["status"],
-                    "ssl_detail": https_result.get("error") or https_result.get("code"),
-                })
+    for (zone_name, hostname), https_result in zip(targets, https_results):
+        cname_values = answers[("CNAME", hostname)]
+        results["hostnames"].append({
+            "hostname": hostname,
+            "zone": zone_name,
+            "cname": cname_values[0] if cname_values else None,
+            "ssl": https_result["status"],
+            "ssl_detail": https_result.get("error") or https_result.get("code"),
+        })
 
     return results
 
@@ -153,7 +307,8 @@ def print_results(results: dict):
             cname_str = h["cname"] or "(not resolving)"
             print(f"  {ssl_icon} {h['hostname']}")
             print(f"      CNAME: {cname_str}")
-            print(f"      SSL:   {h['ssl']} {f'({h["ssl_detail"]})' if h['ssl_detail'] else ''}")
+            ssl_detail = f"({h['ssl_detail']})" if h["ssl_detail"] else ""
+            print(f"      SSL:   {h['ssl']} {ssl_detail}")
         print()
 
 
@@ -161,11 +316,17 @@ def main():
     parser = argparse.ArgumentParser(
         description="Check DNS propagation status for bunny.net domains"
     )
-    parser.add_argument("domain", help="Domain to check")
+    parser.add_argument("domains", nargs="+", metavar="domain", help="Domain(s) to check")
     parser.add_argument(
         "-c", "--config",
         help="Path to config.json (to check pull zone hostnames)",
     )
+    parser.add_argument(
+        "-t", "--timeout",
+        type=float,
+        default=DEFAULT_DNS_TIMEOUT,
+        help=f"Seconds to wait for each DNS lookup (default: {DEFAULT_DNS_TIMEOUT:g})",
+    )
 
     args = parser.parse_args()
 
@@ -177,8 +338,12 @@ def main():
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Warning: Could not load config: {e}", file=sys.stderr)
 
-    results = check_domain(args.domain, config)
-    print_results(results)
+    try:
+        for domain in args.domains:
+            results = check_domain(domain, config, timeout=args.timeout)
+            print_results(results)
+    finally:
+        close_idle_connections()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+"""
+Helpers for fanning out independent bunny.net API calls.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Default number of API calls kept in flight at once
+DEFAULT_MAX_WORKERS = 8
+
+
+def run_concurrently(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    return_exceptions: bool = False,
+) -> list[R]:
+    """
+    Call func on every item using a bounded thread pool.
+
+    The calls are I/O-bound (one HTTP round-trip each), so overlapping them
+    turns N * RTT into roughly ceil(N / max_workers) * RTT.
+
+    Args:
+        func: Callable invoked once per item
+        items: Items to process
+        max_workers: Maximum number of calls in flight at once
+        return_exceptions: Return exceptions raised by func in place of
+            their results instead of re-raising them
+
+    Returns:
+        Results in the same order as items. Unless return_exceptions is set,
+        if any call raises, the first exception (in item order) is re-raised
+        after all calls have finished.
+    """
+    items = list(items)
+    if return_exceptions:
+        func = partial(_capture, func)
+    if max_workers <= 1 or len(items) <= 1:
+        return _run_serially(func, items)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def _run_serially(func: Callable[[T], R], items: list[T]) -> list[R]:
+    """Call func on every item in order, then re-raise the first exception."""
+    results = []
+    error = None
+    for item in items:
+        try:
+            results.append(func(item))
+        except Exception as e:
+            if error is None:
+                error = e
+    if error is not None:
+        raise error
+    return results
+
+
+def _capture(func: Callable[[T], R], item: T) -> "R | Exception":
+    try:
+        return func(item)
+    except Exception as e:
+        return e
@@ -3,30 +3,46 @@ DNS Zone and Record management for bunny.net.
 """
 
 import ipaddress
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import partial
 from typing import Optional
 
 from .bunny_client import BunnyClient, BunnyNotFoundError
+from .concurrency import DEFAULT_MAX_WORKERS, run_concurrently
+
+
+# Largest page size accepted by the /dnszone listing
+ZONES_PER_PAGE = 1000
+
+
+class RecordType(IntEnum):
+    """bunny.net DNS record type codes."""
+    A = 0
+    AAAA = 1
+    CNAME = 2
+    TXT = 3
+    MX = 4
+    RDR = 5      # Bunny.NET Redirect
+    PZ = 7       # Bunny.NET Pull Zone
+    SRV = 8
+    CAA = 9
+    PTR = 10
+    SCR = 11     # Bunny.NET Script
+    NS = 12
 
 
 # DNS Record type mapping
-DNS_RECORD_TYPES = {
-    "A": 0,
-    "AAAA": 1,
-    "CNAME": 2,
-    "TXT": 3,
-    "MX": 4,
-    "RDR": 5,      # Bunny.NET Redirect
-    "PZ": 7,       # Bunny.NET Pull Zone
-    "SRV": 8,
-    "CAA": 9,
-    "PTR": 10,
-    "SCR": 11,     # Bunny.NET Script
-    "NS": 12,
-}
+DNS_RECORD_TYPES = {t.name: t.value for t in RecordType}
 
 DNS_RECORD_TYPES_REVERSE = {v: k for k, v in DNS_RECORD_TYPES.items()}
 
+# Type names indexed by API type code (None for unused codes)
+_TYPE_NAMES_BY_CODE: tuple[Optional[str], ...] = tuple(
+    DNS_RECORD_TYPES_REVERSE.get(code) for code in range(max(RecordType) + 1)
+)
+
 
 @dataclass
 class DNSRecord:
@@ -39,12 +55,26 @@ class DNSRecord:
     weight: Optional[int] = None    # For SRV
     port: Optional[int] = None      # For SRV
     id: Optional[int] = None        # Set when fetched from API
+    _match_key: tuple[str, str, str] = field(init=False, repr=False, compare=False)
+    _type_code: Optional[int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Canonical upper-case type, interned so comparisons are identity checks
+        self.type = sys.intern(self.type.upper())
+        # Unknown types are only rejected when building an API payload
+        self._type_code = DNS_RECORD_TYPES.get(self.type)
+        # Normalize once - matching compares these keys many times per sync
+        self._match_key = (
+            self.type,
+            self._normalize_name(self.name),
+            self._normalize_value(self.value, self.type),
+        )
 
     def to_config_dict(self) -> dict:
         """Convert to config format (inverse of from_api_response)."""
         name = "@" if self.name == "" else self.name
         d = {
-            "type": self.type.upper(),
+            "type": self.type,
             "name": name,
             "value": self.value,
             "ttl": self.ttl,
@@ -59,8 +89,10 @@ class DNSRecord:
 
     def to_api_payload(self) -> dict:
         """Convert to API request payload."""
+        if self._type_code is None:
+            raise KeyError(self.type)
         payload = {
-            "Type": DNS_RECORD_TYPES[self.type.upper()],
+            "Type": self._type_code,
             "Name": self.name,
             "Value": self.value,
             "Ttl": self.ttl,
@@ -76,10 +108,13 @@ class DNSRecord:
     @classmethod
     def from_api_response(cls, data: dict) -> "DNSRecord":
         """Create DNSRecord from API response."""
-        record_type = DNS_RECORD_TYPES_REVERSE.get(data.get("Type", 0), "A")
+        code = data.get("Type", 0)
+        record_type = None
+        if isinstance(code, int) and 0 <= code < len(_TYPE_NAMES_BY_CODE):
+            record_type = _TYPE_NAMES_BY_CODE[code]
         return cls(
             id=data.get("Id"),
-            type=record_type,
+            type=record_type or "A",
             name=data.get("Name", ""),
             value=data.get("Value", ""),
             ttl=data.get("Ttl", 300),
@@ -95,20 +130,20 @@ class DNSRecord:
 
     def _normalize_value(self, value: str, record_type: str) -> str:
         """Normalize record value - expand IPv6 addresses to allow comparison."""
-        if record_type.upper() == "AAAA":
+        if record_type == "AAAA":
             try:
                 return str(ipaddress.IPv6Address(value))
             except ValueError:
                 pass
         return value
 
+    def match_key(self) -> tuple[str, str, str]:
+        """Hashable identity of the record (normalized type, name, value)."""
+        return self._match_key
+
     def matches(self, other: "DNSRecord") -> bool:
         """Check if two records match (same type, name, value)."""
-        return (
-            self.type.upper() == other.type.upper()
-            and self._normalize_name(self.name) == self._normalize_name(other.name)
-            and self._normalize_value(self.value, self.type) == self._normalize_value(other.value, other.type)
-        )
+        return self._match_key == other._match_key
 
     def _normalize_optional(self, val) -> int:
         """Normalize optional int fields - treat None and 0 as equivalent."""
@@ -154,14 +189,38 @@ class DNSZone:
 class DNSManager:
     """Manages DNS zones and records on bunny.net."""
 
-    def __init__(self, client: BunnyClient):
+    def __init__(self, client: BunnyClient, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Args:
+            client: API client shared by all managers
+            max_workers: Maximum record mutations in flight during sync_zone
+                (1 applies them one at a time)
+        """
         self.client = client
+        self.max_workers = max_workers
+
+    def list_zones(self, search: Optional[str] = None) -> list[DNSZone]:
+        """
+        List DNS zones, following pagination.
 
-    def list_zones(self) -> list[DNSZone]:
-        """List all DNS zones."""
-        response = self.client.get("/dnszone")
-        items = response.get("Items", []) if response else []
-        return [DNSZone.from_api_response(z) for z in items]
+        Pages are served from the client's GET cache until a zone or record
+        changes.
+
+        Args:
+            search: Optional server-side filter on the zone domain
+        """
+        zones = []
+        page = 1
+        while True:
+            params = {"page": page, "perPage": ZONES_PER_PAGE}
+            if search:
+                params["search"] = search
+            response = self.client.get("/dnszone", params=params)
+            items = response.get("Items", []) if response else []
+            zones.extend(DNSZone.from_api_response(z) for z in items)
+            if not response or not response.get("HasMoreItems"):
+                return zones
+            page += 1
 
     def get_zone(self, zone_id: int) -> DNSZone:
         """Get a DNS zone by ID."""
@@ -170,10 +229,13 @@ class DNSManager:
 
     def get_zone_by_domain(self, domain: str) -> Optional[DNSZone]:
         """Find a DNS zone by domain name."""
-        zones = self.list_zones()
-        for zone in zones:
+        # Let the API narrow the listing (search is a substring match)
+        for zone in self.list_zones(search=domain):
             if zone.domain.lower() == domain.lower():
-                # Fetch full zone with records
+                # The listing usually embeds records already; only fetch the
+                # full zone when they are missing
+                if zone.records:
+                    return zone
                 return self.get_zone(zone.id)
         return None
 
@@ -219,10 +281,14 @@ class DNSManager:
         Returns:
             Dict mapping domain names to lists of record config dicts.
         """
-        result = {}
         zones = self.list_zones()
-        for zone_summary in zones:
-            zone = self.get_zone(zone_summary.id)
+        # The listing embeds records; fetch only zones listed without any,
+        # concurrently
+        bare = [z.id for z in zones if not z.records]
+        fetched = dict(zip(bare, run_concurrently(self.get_zone, bare, self.max_workers)))
+        result = {}
+        for zone in zones:
+            zone = fetched.get(zone.id, zone)
             result[zone.domain] = [r.to_config_dict() for r in zone.records]
         return result
 
@@ -282,40 +348,53 @@ class DNSManager:
         # Current records from API
         current = zone.records
 
-        # Track which current records are matched
-        matched_current_ids = set()
+        # Index current records by identity; the first record wins on duplicates
+        # and later copies are always extra. Matched entries are popped, so
+        # whatever is left afterwards is exactly the set of extra records.
+        unmatched: dict[tuple[str, str, str], DNSRecord] = {}
+        duplicates: list[DNSRecord] = []
+        for current_rec in current:
+            if unmatched.setdefault(current_rec.match_key(), current_rec) is not current_rec:
+                duplicates.append(current_rec)
+        # Desired records repeated in the config reuse their first match
+        matched: dict[tuple[str, str, str], DNSRecord] = {}
+
+        # Planned mutations, dispatched concurrently once the diff is known
+        to_create: list[DNSRecord] = []
+        # Keyed by record id: a record repeated in the config is written once,
+        # and as in a serial sync the last copy needing an update wins
+        to_update: dict[int, DNSRecord] = {}
+        to_delete: list[int] = []
 
         # Find records to create or update
         for desired_rec in desired:
-            found = False
-            for current_rec in current:
-                if desired_rec.matches(current_rec):
-                    found = True
-                    matched_current_ids.add(current_rec.id)
-                    if current_rec.needs_update(desired_rec):
-                        desc = f"{desired_rec.type} {desired_rec.name} -> {desired_rec.value}"
-                        result["updated"].append(desc)
-                        if not dry_run:
-                            desired_rec.id = current_rec.id
-                            self.update_record(zone.id, current_rec.id, desired_rec)
-                    else:
-                        result["unchanged"].append(
-                            f"{desired_rec.type} {desired_rec.name} -> {desired_rec.value}"
-                        )
-                    break
-            if not found:
-                desc = f"{desired_rec.type} {desired_rec.name} -> {desired_rec.value}"
+            desc = f"{desired_rec.type} {desired_rec.name} -> {desired_rec.value}"
+            key = desired_rec.match_key()
+            current_rec = unmatched.pop(key, None) or matched.get(key)
+            if current_rec is None:
                 result["created"].append(desc)
-                if not dry_run:
-                    self.add_record(zone.id, desired_rec)
-
-        # Find records to delete (in current but not in desired)
+                to_create.append(desired_rec)
+                continue
+            matched[key] = current_rec
+            if current_rec.needs_update(desired_rec):
+                result["updated"].append(desc)
+                desired_rec.id = current_rec.id
+                to_update[current_rec.id] = desired_rec
+            else:
+                result["unchanged"].append(desc)
+
+        # Whatever was not matched is in current but not in desired
         if delete_extra:
-            for current_rec in current:
-                if current_rec.id not in matched_current_ids:
-                    desc = f"{current_rec.type} {current_rec.name} -> {current_rec.value}"
-                    result["deleted"].append(desc)
-                    if not dry_run:
-                        self.delete_record(zone.id, current_rec.id)
+            for current_rec in [*unmatched.values(), *duplicates]:
+                desc = f"{current_rec.type} {current_rec.name} -> {current_rec.value}"
+                result["deleted"].append(desc)
+                to_delete.append(current_rec.id)
+
+        if not dry_run:
+            # Creates and updates first, then deletes - same ordering as a serial sync
+            writes = [partial(self.add_record, zone.id, rec) for rec in to_create]
+            writes += [partial(self.update_record, zone.id, rec.id, rec) for rec in to_update.values()]
+            run_concurrently(lambda call: call(), writes, self.max_workers)
+            run_concurrently(partial(self.delete_record, zone.id), to_delete, self.max_workers)
 
         return result
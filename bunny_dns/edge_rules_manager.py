@@ -2,65 +2,105 @@
 Edge Rules management for bunny.net Pull Zones.
 """
 
+import re
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from enum import IntEnum
+from functools import partial
+from typing import Any, Iterable, Iterator, Optional
 
 from .bunny_client import BunnyClient
+from .concurrency import DEFAULT_MAX_WORKERS, run_concurrently
+
+
+class EdgeRuleActionType(IntEnum):
+    """bunny.net edge rule action codes."""
+    force_ssl = 0
+    redirect = 1
+    origin_url = 2
+    override_cache_time = 3
+    block = 4
+    set_response_header = 5
+    set_request_header = 6
+    force_download = 7
+    disable_token_auth = 8
+    enable_token_auth = 9
+    override_cache_time_public = 10
+    ignore_query_string = 11
+    disable_optimizer = 12
+    force_compression = 13
+    set_status_code = 14
+    bypass_perma_cache = 15
+
+
+class EdgeRuleTriggerType(IntEnum):
+    """bunny.net edge rule trigger codes."""
+    url = 0
+    request_header = 1
+    response_header = 2
+    url_extension = 3
+    country_code = 4
+    remote_ip = 5
+    url_query_string = 6
+    random_chance = 7
+    status_code = 8
+    request_method = 9
+
+
+class EdgeRuleMatchType(IntEnum):
+    """bunny.net pattern/trigger matching codes."""
+    any = 0
+    all = 1
+    none = 2
+
+
+# Name <-> code tables derived from the enums. Lookups with a fallback
+# (unknown names or codes from the API) stay a single dict.get.
+ACTION_TYPES = {t.name: t.value for t in EdgeRuleActionType}
+ACTION_TYPES_REVERSE = {v: k for k, v in ACTION_TYPES.items()}
 
+TRIGGER_TYPES = {t.name: t.value for t in EdgeRuleTriggerType}
+TRIGGER_TYPES_REVERSE = {v: k for k, v in TRIGGER_TYPES.items()}
 
-# Edge Rule Action Types
-ACTION_TYPES = {
-    "force_ssl": 0,
-    "redirect": 1,
-    "origin_url": 2,
-    "override_cache_time": 3,
-    "block": 4,
-    "set_response_header": 5,
-    "set_request_header": 6,
-    "force_download": 7,
-    "disable_token_auth": 8,
-    "enable_token_auth": 9,
-    "override_cache_time_public": 10,
-    "ignore_query_string": 11,
-    "disable_optimizer": 12,
-    "force_compression": 13,
-    "set_status_code": 14,
-    "bypass_perma_cache": 15,
-}
+MATCH_TYPES = {t.name: t.value for t in EdgeRuleMatchType}
+MATCH_TYPES_REVERSE = {v: k for k, v in MATCH_TYPES.items()}
 
-ACTION_TYPES_REVERSE = {v: k for k, v in ACTION_TYPES.items()}
 
-# Edge Rule Trigger Types
-TRIGGER_TYPES = {
-    "url": 0,
-    "request_header": 1,
-    "response_header": 2,
-    "url_extension": 3,
-    "country_code": 4,
-    "remote_ip": 5,
-    "url_query_string": 6,
-    "random_chance": 7,
-    "status_code": 8,
-    "request_method": 9,
-}
+def _intern(value: Any) -> Any:
+    """Intern string type names; leave anything else (e.g. None) as is."""
+    return sys.intern(value) if isinstance(value, str) else value
 
-TRIGGER_TYPES_REVERSE = {v: k for k, v in TRIGGER_TYPES.items()}
 
-# Pattern Matching Types
-MATCH_TYPES = {
-    "any": 0,
-    "all": 1,
-    "none": 2,
-}
+# Suffix parse_rule_from_config adds when splitting a multi-action rule
+_ACTION_SUFFIX_RE = re.compile(r" \(action \d+\)$")
 
 
-@dataclass
+@dataclass(slots=True)
 class EdgeRuleTrigger:
     """Represents an edge rule trigger."""
     type: str
     patterns: list[str] = field(default_factory=list)
     match: str = "any"  # any, all, none
     parameter: Optional[str] = None  # For header name, etc.
+    _type_code: int = field(init=False, repr=False, compare=False)
+    _match_code: int = field(init=False, repr=False, compare=False)
+    _cached_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Config values come from json.loads and are not interned; interning
+        # lets the table lookups below (and later ones) match by identity
+        self.type = _intern(self.type)
+        self.match = _intern(self.match)
+        # Resolve API codes once rather than on every to_api_payload
+        self._type_code = TRIGGER_TYPES.get(self.type, 0)
+        self._match_code = MATCH_TYPES.get(self.match, 0)
+
+    @property
+    def _group_key(self) -> tuple:
+        """Hashable identity used to regroup split rules; built on first use."""
+        if self._cached_key is None:
+            self._cached_key = (self.type, tuple(self.patterns), self.match, self.parameter or "")
+        return self._cached_key
 
     def to_config_dict(self) -> dict:
         """Convert to config format (inverse of parse_trigger_from_config)."""
@@ -74,10 +114,11 @@ class EdgeRuleTrigger:
         return d
 
     def to_api_payload(self) -> dict:
+        """Convert to API payload."""
         payload = {
-            "Type": TRIGGER_TYPES.get(self.type, 0),
-            "PatternMatches": self.patterns,
-            "PatternMatchingType": MATCH_TYPES.get(self.match, 0),
+            "Type": self._type_code,
+            "PatternMatches": list(self.patterns),
+            "PatternMatchingType": self._match_code,
         }
         if self.parameter:
             payload["Parameter1"] = self.parameter
@@ -86,11 +127,7 @@ class EdgeRuleTrigger:
     @classmethod
     def from_api_response(cls, data: dict) -> "EdgeRuleTrigger":
         trigger_type = TRIGGER_TYPES_REVERSE.get(data.get("Type", 0), "url")
-        match_type = "any"
-        for name, value in MATCH_TYPES.items():
-            if value == data.get("PatternMatchingType", 0):
-                match_type = name
-                break
+        match_type = MATCH_TYPES_REVERSE.get(data.get("PatternMatchingType", 0), "any")
         return cls(
             type=trigger_type,
             patterns=data.get("PatternMatches", []),
@@ -99,48 +136,26 @@ class EdgeRuleTrigger:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EdgeRuleAction:
     """Represents an edge rule action."""
     type: str
     parameter1: Optional[str] = None  # Header name, redirect URL, etc.
     parameter2: Optional[str] = None  # Header value, etc.
+    _action_code: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.type = _intern(self.type)
+        self._action_code = ACTION_TYPES.get(self.type, 0)
 
     def to_config_dict(self) -> dict:
         """Convert to config format (inverse of parse_action_from_config)."""
-        if self.type in ("set_response_header", "set_request_header"):
-            return {
-                "type": self.type,
-                "header": self.parameter1 or "",
-                "value": self.parameter2 or "",
-            }
-        elif self.type == "redirect":
-            return {
-                "type": self.type,
-                "url": self.parameter1 or "",
-                "status_code": self.parameter2 or "301",
-            }
-        elif self.type == "origin_url":
-            return {
-                "type": self.type,
-                "url": self.parameter1 or "",
-            }
-        elif self.type == "override_cache_time":
-            return {
-                "type": self.type,
-                "seconds": int(self.parameter1) if self.parameter1 else 0,
-            }
-        elif self.type == "set_status_code":
-            return {
-                "type": self.type,
-                "code": int(self.parameter1) if self.parameter1 else 200,
-            }
-        else:
-            return {"type": self.type}
+        formatter = _ACTION_CONFIG_FORMATTERS.get(self.type)
+        return formatter(self) if formatter else {"type": self.type}
 
     def to_api_payload(self) -> dict:
         payload = {
-            "ActionType": ACTION_TYPES.get(self.type, 0),
+            "ActionType": self._action_code,
         }
         if self.parameter1 is not None:
             payload["ActionParameter1"] = self.parameter1
@@ -149,7 +164,7 @@ class EdgeRuleAction:
         return payload
 
 
-@dataclass
+@dataclass(slots=True)
 class EdgeRule:
     """Represents an edge rule."""
     description: str
@@ -158,6 +173,11 @@ class EdgeRule:
     actions: list[EdgeRuleAction] = field(default_factory=list)
     trigger_match: str = "all"  # any, all, none
     guid: Optional[str] = None
+    _trigger_match_code: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.trigger_match = _intern(self.trigger_match)
+        self._trigger_match_code = MATCH_TYPES.get(self.trigger_match, 1)
 
     def to_api_payload(self) -> dict:
         """Convert to API payload. Note: Creates one rule per action."""
@@ -169,9 +189,9 @@ class EdgeRule:
         # Use first action for the main rule payload
         action = self.actions[0]
         payload = {
-            "ActionType": ACTION_TYPES.get(action.type, 0),
+            "ActionType": action._action_code,
             "Triggers": [t.to_api_payload() for t in self.triggers],
-            "TriggerMatchingType": MATCH_TYPES.get(self.trigger_match, 1),
+            "TriggerMatchingType": self._trigger_match_code,
             "Description": self.description,
             "Enabled": self.enabled,
         }
@@ -197,11 +217,7 @@ class EdgeRule:
                 parameter2=data.get("ActionParameter2"),
             )
         ]
-        trigger_match = "all"
-        for name, value in MATCH_TYPES.items():
-            if value == data.get("TriggerMatchingType", 1):
-                trigger_match = name
-                break
+        trigger_match = MATCH_TYPES_REVERSE.get(data.get("TriggerMatchingType", 1), "all")
         return cls(
             guid=data.get("Guid"),
             description=data.get("Description", ""),
@@ -212,40 +228,52 @@ class EdgeRule:
         )
 
 
+# Per-type config <-> EdgeRuleAction converters; types not listed here take
+# no parameters and map to just {"type": ...}
+_ACTION_CONFIG_FORMATTERS = {
+    "set_response_header": lambda a: {
+        "type": a.type, "header": a.parameter1 or "", "value": a.parameter2 or "",
+    },
+    "set_request_header": lambda a: {
+        "type": a.type, "header": a.parameter1 or "", "value": a.parameter2 or "",
+    },
+    "redirect": lambda a: {
+        "type": a.type, "url": a.parameter1 or "", "status_code": a.parameter2 or "301",
+    },
+    "origin_url": lambda a: {"type": a.type, "url": a.parameter1 or ""},
+    "override_cache_time": lambda a: {
+        "type": a.type, "seconds": int(a.parameter1) if a.parameter1 else 0,
+    },
+    "set_status_code": lambda a: {
+        "type": a.type, "code": int(a.parameter1) if a.parameter1 else 200,
+    },
+}
+
+_ACTION_PARSERS = {
+    "set_response_header": lambda c: EdgeRuleAction(
+        type="set_response_header", parameter1=c.get("header"), parameter2=c.get("value"),
+    ),
+    "set_request_header": lambda c: EdgeRuleAction(
+        type="set_request_header", parameter1=c.get("header"), parameter2=c.get("value"),
+    ),
+    "redirect": lambda c: EdgeRuleAction(
+        type="redirect", parameter1=c.get("url"), parameter2=c.get("status_code", "301"),
+    ),
+    "origin_url": lambda c: EdgeRuleAction(type="origin_url", parameter1=c.get("url")),
+    "override_cache_time": lambda c: EdgeRuleAction(
+        type="override_cache_time", parameter1=str(c.get("seconds", 0)),
+    ),
+    "set_status_code": lambda c: EdgeRuleAction(
+        type="set_status_code", parameter1=str(c.get("code", 200)),
+    ),
+}
+
+
 def parse_action_from_config(action_config: dict) -> EdgeRuleAction:
     """Parse an action from config format."""
     action_type = action_config.get("type", "block")
-
-    # Handle different action types
-    if action_type in ("set_response_header", "set_request_header"):
-        return EdgeRuleAction(
-            type=action_type,
-            parameter1=action_config.get("header"),
-            parameter2=action_config.get("value"),
-        )
-    elif action_type == "redirect":
-        return EdgeRuleAction(
-            type=action_type,
-            parameter1=action_config.get("url"),
-            parameter2=action_config.get("status_code", "301"),
-        )
-    elif action_type == "origin_url":
-        return EdgeRuleAction(
-            type=action_type,
-            parameter1=action_config.get("url"),
-        )
-    elif action_type == "override_cache_time":
-        return EdgeRuleAction(
-            type=action_type,
-            parameter1=str(action_config.get("seconds", 0)),
-        )
-    elif action_type == "set_status_code":
-        return EdgeRuleAction(
-            type=action_type,
-            parameter1=str(action_config.get("code", 200)),
-        )
-    else:
-        return EdgeRuleAction(type=action_type)
+    parser = _ACTION_PARSERS.get(action_type)
+    return parser(action_config) if parser else EdgeRuleAction(type=action_type)
 
 
 def parse_trigger_from_config(trigger_config: dict) -> EdgeRuleTrigger:
@@ -273,24 +301,23 @@ def parse_rule_from_config(rule_config: dict) -> list[EdgeRule]:
     ]
 
     # Create one rule per action (API limitation)
+    base_desc = rule_config.get("description", "Edge Rule")
+    enabled = rule_config.get("enabled", True)
+    trigger_match = rule_config.get("trigger_match", "all")
+    multi = len(actions) > 1
     rules = []
     for i, action in enumerate(actions):
-        desc = rule_config.get("description", "Edge Rule")
-        if len(actions) > 1:
-            desc = f"{desc} (action {i + 1})"
+        desc = f"{base_desc} (action {i + 1})" if multi else base_desc
         rules.append(EdgeRule(
             description=desc,
-            enabled=rule_config.get("enabled", True),
+            enabled=enabled,
             triggers=triggers,
             actions=[action],
-            trigger_match=rule_config.get("trigger_match", "all"),
+            trigger_match=trigger_match,
         ))
     return rules
 
 
-import re
-
-
 def group_api_rules_to_config(rules: list[EdgeRule]) -> list[dict]:
     """Group API rules (1 action each) back into multi-action config rules.
 
@@ -300,23 +327,16 @@ def group_api_rules_to_config(rules: list[EdgeRule]) -> list[dict]:
     """
     # Build groups: key = (base_description, enabled, trigger_match, triggers_repr)
     groups: dict[tuple, list[EdgeRule]] = {}
-    action_suffix_re = re.compile(r" \(action \d+\)$")
 
     for rule in rules:
-        base_desc = action_suffix_re.sub("", rule.description)
-        triggers_key = tuple(
-            (t.type, tuple(t.patterns), t.match, t.parameter or "")
-            for t in rule.triggers
-        )
+        base_desc = _ACTION_SUFFIX_RE.sub("", rule.description)
+        triggers_key = tuple(t._group_key for t in rule.triggers)
         key = (base_desc, rule.enabled, rule.trigger_match, triggers_key)
         groups.setdefault(key, []).append(rule)
 
     result = []
     for (base_desc, enabled, trigger_match, _), group_rules in groups.items():
-        actions = []
-        for r in group_rules:
-            for a in r.actions:
-                actions.append(a.to_config_dict())
+        actions = [a.to_config_dict() for r in group_rules for a in r.actions]
         triggers = [t.to_config_dict() for t in group_rules[0].triggers]
         config_rule = {
             "description": base_desc,
@@ -332,14 +352,24 @@ def group_api_rules_to_config(rules: list[EdgeRule]) -> list[dict]:
 class EdgeRulesManager:
     """Manages Edge Rules on bunny.net Pull Zones."""
 
-    def __init__(self, client: BunnyClient):
+    def __init__(self, client: BunnyClient, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Args:
+            client: API client shared by all managers
+            max_workers: Maximum rule deletions in flight at once
+        """
         self.client = client
+        self.max_workers = max_workers
 
-    def get_rules(self, zone_id: int) -> list[EdgeRule]:
-        """Get all edge rules for a Pull Zone."""
+    def iter_rules(self, zone_id: int) -> Iterator[EdgeRule]:
+        """Yield the edge rules for a Pull Zone, parsing each one on demand."""
         response = self.client.get(f"/pullzone/{zone_id}")
         rules_data = response.get("EdgeRules", []) if response else []
-        return [EdgeRule.from_api_response(r) for r in rules_data]
+        return (EdgeRule.from_api_response(r) for r in rules_data)
+
+    def get_rules(self, zone_id: int) -> list[EdgeRule]:
+        """Get all edge rules for a Pull Zone."""
+        return list(self.iter_rules(zone_id))
 
     def export_rules(self, zone_id: int) -> list[dict]:
         """Export edge rules for a Pull Zone as config dicts."""
@@ -355,12 +385,18 @@ class EdgeRulesManager:
         """Delete an edge rule by GUID."""
         self.client.delete(f"/pullzone/{zone_id}/edgerules/{rule_guid}")
 
-    def delete_all_rules(self, zone_id: int) -> None:
-        """Delete all edge rules for a Pull Zone."""
-        rules = self.get_rules(zone_id)
-        for rule in rules:
-            if rule.guid:
-                self.delete_rule(zone_id, rule.guid)
+    def delete_all_rules(self, zone_id: int, rules: Optional[Iterable[EdgeRule]] = None) -> None:
+        """
+        Delete all edge rules for a Pull Zone.
+
+        Args:
+            zone_id: Pull Zone ID
+            rules: The zone's current rules, if the caller already fetched them
+        """
+        if rules is None:
+            rules = self.iter_rules(zone_id)
+        guids = (rule.guid for rule in rules if rule.guid)
+        run_concurrently(partial(self.delete_rule, zone_id), guids, self.max_workers)
 
     def sync_rules(
         self,
@@ -381,12 +417,6 @@ class EdgeRulesManager:
         Returns:
             Dict with changes made
         """
-        result = {
-            "deleted": [],
-            "created": [],
-            "changes": [],
-        }
-
         # Get current rules
         current_rules = self.get_rules(zone_id)
 
@@ -397,19 +427,25 @@ class EdgeRulesManager:
 
         # Strategy: Delete all existing, create all from config
         # This is simpler than trying to diff by GUID since config doesn't have GUIDs
+        deleted = [rule.description for rule in current_rules]
+        created = [rule.description for rule in desired_rules]
+        result = {
+            "deleted": deleted,
+            "created": created,
+            # Same descriptions as above, kept for parity with pull zone results
+            "changes": [
+                *("Deleting rule: " + desc for desc in deleted),
+                *("Creating rule: " + desc for desc in created),
+            ],
+        }
+        if dry_run:
+            return result
 
-        # Delete existing rules
-        for rule in current_rules:
-            result["deleted"].append(rule.description)
-            result["changes"].append(f"Deleting rule: {rule.description}")
-            if not dry_run and rule.guid:
-                self.delete_rule(zone_id, rule.guid)
+        # Delete existing rules, reusing the rules fetched above
+        self.delete_all_rules(zone_id, current_rules)
 
-        # Create new rules
+        # Create new rules one at a time so they keep their config order
         for rule in desired_rules:
-            result["created"].append(rule.description)
-            result["changes"].append(f"Creating rule: {rule.description}")
-            if not dry_run:
-                self.add_or_update_rule(zone_id, rule)
+            self.add_or_update_rule(zone_id, rule)
 
         return result
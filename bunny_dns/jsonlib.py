@@ -0,0 +1,46 @@
+"""
+JSON encoding/decoding, using orjson when it is installed.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document from bytes or str.
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, ensure_ascii: bool = False) -> str:
+    """
+    Serialize obj to a JSON string.
+
+    Args:
+        obj: JSON-compatible value (dict keys must be strings)
+        indent: Pretty-print with two-space indentation
+        ensure_ascii: Escape non-ASCII characters as \\uXXXX, so the output
+            can be written to any terminal encoding (orjson cannot, so this
+            always uses the stdlib)
+    """
+    if ensure_ascii:
+        if indent:
+            return json.dumps(obj, indent=2)
+        return json.dumps(obj, separators=(",", ":"))
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    # Match orjson's output: UTF-8 rather than \u escapes, no space padding
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
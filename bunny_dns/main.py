@@ -12,15 +12,30 @@ Usage:
 """
 
 import argparse
-import json
 import os
+import socket
 import sys
+import threading
+from urllib.parse import urlsplit
 
-from dotenv import load_dotenv
+from . import jsonlib
 
-load_dotenv()
 
-from .sync import BunnySync, print_results
+def _prefetch_host(url: str) -> None:
+    """Resolve url's host in the background so the first API call finds it cached.
+
+    Only helps where the OS caches lookups (e.g. systemd-resolved, nscd);
+    failures are ignored and surface on the real request instead.
+    """
+    parts = urlsplit(url)
+
+    def resolve() -> None:
+        try:
+            socket.getaddrinfo(parts.hostname, parts.port or 443, type=socket.SOCK_STREAM)
+        except OSError:
+            pass
+
+    threading.Thread(target=resolve, daemon=True).start()
 
 
 def main():
@@ -77,6 +92,21 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.sot == "bunny" and not args.domain and not args.pull_all:
+        print("Error: --sot bunny requires either --domain or --all", file=sys.stderr)
+        sys.exit(1)
+    if args.sot == "local" and not args.config:
+        print("Error: --config is required for --sot local", file=sys.stderr)
+        sys.exit(1)
+
+    # Deferred until after argument parsing so --help and usage errors
+    # skip reading .env and importing the API client stack
+    from dotenv import load_dotenv
+
+    from .bunny_client import BunnyClient
+    from .sync import BunnySync, print_results
+
+    load_dotenv()
 
     # Get API key
     api_key = args.api_key or os.environ.get("BUNNY_API_KEY")
@@ -84,70 +114,64 @@ def main():
         print("Error: API key required. Set BUNNY_API_KEY env var or use --api-key", file=sys.stderr)
         sys.exit(1)
 
+    _prefetch_host(BunnyClient.BASE_URL)
+
     if args.sot == "bunny":
         # Pull mode
-        if not args.domain and not args.pull_all:
-            print("Error: --sot bunny requires either --domain or --all", file=sys.stderr)
-            sys.exit(1)
-
         try:
-            syncer = BunnySync(api_key)
-            config = syncer.pull(
-                domain=args.domain,
-                pull_all=args.pull_all,
-                dns_only=args.dns_only,
-                pullzones_only=args.pullzones_only,
-            )
-            if config is None:
-                print(
-                    f"Error: Domain '{args.domain}' not found on your account. "
-                    f"Check if you typed the domain correctly.",
-                    file=sys.stderr,
+            with BunnySync(api_key) as syncer:
+                config = syncer.pull(
+                    domain=args.domain,
+                    pull_all=args.pull_all,
+                    dns_only=args.dns_only,
+                    pullzones_only=args.pullzones_only,
                 )
-                sys.exit(1)
-            output = json.dumps(config, indent=2)
-            if args.output:
-                with open(args.output, "w") as f:
-                    f.write(output + "\n")
-                print(f"Config written to {args.output}", file=sys.stderr)
-            else:
-                print(output)
+                if config is None:
+                    print(
+                        f"Error: Domain '{args.domain}' not found on your account. "
+                        f"Check if you typed the domain correctly.",
+                        file=sys.stderr,
+                    )
+                    sys.exit(1)
+                # ASCII-escaped, so printing works whatever the terminal encoding
+                output = jsonlib.dumps(config, indent=True, ensure_ascii=True)
+                if args.output:
+                    with open(args.output, "w", encoding="utf-8") as f:
+                        f.write(output + "\n")
+                    print(f"Config written to {args.output}", file=sys.stderr)
+                else:
+                    print(output)
         except Exception as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
     else:
         # Push mode (existing behavior)
-        if not args.config:
-            print("Error: --config is required for --sot local", file=sys.stderr)
-            sys.exit(1)
-
         if not os.path.exists(args.config):
             print(f"Error: Config file not found: {args.config}", file=sys.stderr)
             sys.exit(1)
 
         try:
-            syncer = BunnySync(api_key)
-
-            if args.dns_only:
-                results = syncer.sync_dns_only(
-                    config=args.config,
-                    dry_run=args.dry_run,
-                    delete_extra_records=not args.no_delete,
-                    domain=args.domain,
-                )
-            elif args.pullzones_only:
-                results = syncer.sync_pullzones_only(
-                    config=args.config,
-                    dry_run=args.dry_run,
-                    domain=args.domain,
-                )
-            else:
-                results = syncer.sync(
-                    config=args.config,
-                    dry_run=args.dry_run,
-                    delete_extra_records=not args.no_delete,
-                    domain=args.domain,
-                )
+            with BunnySync(api_key) as syncer:
+                if args.dns_only:
+                    results = syncer.sync_dns_only(
+                        config=args.config,
+                        dry_run=args.dry_run,
+                        delete_extra_records=not args.no_delete,
+                        domain=args.domain,
+                    )
+                elif args.pullzones_only:
+                    results = syncer.sync_pullzones_only(
+                        config=args.config,
+                        dry_run=args.dry_run,
+                        domain=args.domain,
+                    )
+                else:
+                    results = syncer.sync(
+                        config=args.config,
+                        dry_run=args.dry_run,
+                        delete_extra_records=not args.no_delete,
+                        domain=args.domain,
+                    )
 
             print_results(results)
 
@@ -2,10 +2,20 @@
 Pull Zone management for bunny.net.
 """
 
+import random
+import sys
+import time
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from functools import partial, wraps
+from typing import Any, Callable, Optional
 
-from .bunny_client import BunnyClient, BunnyNotFoundError
+from .bunny_client import (
+    BunnyAPIError,
+    BunnyClient,
+    BunnyNotFoundError,
+    TRANSIENT_STATUS_CODES,
+)
+from .concurrency import DEFAULT_MAX_WORKERS, run_concurrently
 
 
 # Pull Zone type mapping
@@ -16,8 +26,22 @@ PULLZONE_TYPES = {
 
 PULLZONE_TYPES_REVERSE = {v: k for k, v in PULLZONE_TYPES.items()}
 
+# Region code -> PullZone attribute holding its pricing zone flag
+_REGION_SPECS = (
+    ("US", "enable_geo_zone_us"),
+    ("EU", "enable_geo_zone_eu"),
+    ("ASIA", "enable_geo_zone_asia"),
+    ("SA", "enable_geo_zone_sa"),
+    ("AF", "enable_geo_zone_af"),
+)
 
-@dataclass
+
+def _name_key(name: str) -> str:
+    """Case-insensitive, interned lookup key for zone names and hostnames."""
+    return sys.intern(name.casefold())
+
+
+@dataclass(slots=True)
 class Hostname:
     """Represents a custom hostname on a Pull Zone."""
     value: str
@@ -28,16 +52,17 @@ class Hostname:
 
     @classmethod
     def from_api_response(cls, data: dict) -> "Hostname":
+        get = data.get
         return cls(
-            id=data.get("Id"),
-            value=data.get("Value", ""),
-            force_ssl=data.get("ForceSSL", False),
-            has_certificate=data.get("HasCertificate", False),
-            is_system_hostname=data.get("IsSystemHostname", False),
+            id=get("Id"),
+            value=get("Value", ""),
+            force_ssl=get("ForceSSL", False),
+            has_certificate=get("HasCertificate", False),
+            is_system_hostname=get("IsSystemHostname", False),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PullZone:
     """Represents a Pull Zone."""
     name: str
@@ -58,24 +83,38 @@ class PullZone:
 
     @classmethod
     def from_api_response(cls, data: dict) -> "PullZone":
-        hostnames = [
-            Hostname.from_api_response(h)
-            for h in data.get("Hostnames", [])
-        ]
+        # Runs once per zone and hostname in a listing, so the dict lookups
+        # are bound to locals
+        get = data.get
+        parse_hostname = Hostname.from_api_response
         return cls(
-            id=data.get("Id"),
-            name=data.get("Name", ""),
-            origin_url=data.get("OriginUrl"),
-            origin_host_header=data.get("OriginHostHeader"),
-            type=data.get("Type", 0),
-            enabled=data.get("Enabled", True),
-            hostnames=hostnames,
-            edge_rules=data.get("EdgeRules", []),
-            enable_geo_zone_us=data.get("EnableGeoZoneUS", True),
-            enable_geo_zone_eu=data.get("EnableGeoZoneEU", True),
-            enable_geo_zone_asia=data.get("EnableGeoZoneASIA", True),
-            enable_geo_zone_sa=data.get("EnableGeoZoneSA", True),
-            enable_geo_zone_af=data.get("EnableGeoZoneAF", True),
+            id=get("Id"),
+            name=get("Name", ""),
+            origin_url=get("OriginUrl"),
+            origin_host_header=get("OriginHostHeader"),
+            type=get("Type", 0),
+            enabled=get("Enabled", True),
+            hostnames=[parse_hostname(h) for h in get("Hostnames", [])],
+            edge_rules=get("EdgeRules", []),
+            enable_geo_zone_us=get("EnableGeoZoneUS", True),
+            enable_geo_zone_eu=get("EnableGeoZoneEU", True),
+            enable_geo_zone_asia=get("EnableGeoZoneASIA", True),
+            enable_geo_zone_sa=get("EnableGeoZoneSA", True),
+            enable_geo_zone_af=get("EnableGeoZoneAF", True),
+        )
+
+    def matches(self, desired: "PullZone") -> bool:
+        """
+        Whether this zone already has the settings sync_zone manages.
+
+        Origin fields left unset on desired are not compared, matching how
+        sync_zone leaves them alone.
+        """
+        return (
+            (not desired.origin_url or self.origin_url == desired.origin_url)
+            and (not desired.origin_host_header or self.origin_host_header == desired.origin_host_header)
+            and self.type == desired.type
+            and all(getattr(self, attr) == getattr(desired, attr) for _, attr in _REGION_SPECS)
         )
 
     def to_api_payload(self) -> dict:
@@ -124,14 +163,52 @@ class PullZone:
         return d
 
 
+def _retries_status(*status_codes: int) -> Callable:
+    """
+    Retry API errors with the given status codes with the client's
+    exponential backoff.
+
+    Only for failures the transport does not already retry: its urllib3
+    Retry covers connection errors and 502/503/504 on idempotent methods.
+    """
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self: "PullZoneManager", *args, **kwargs):
+            client = self.client
+            for attempt in range(client.max_retries + 1):
+                try:
+                    return method(self, *args, **kwargs)
+                except BunnyAPIError as e:
+                    if attempt >= client.max_retries or e.status_code not in status_codes:
+                        raise
+                    delay = min(client.retry_delay * (2 ** attempt), client.max_retry_delay)
+                    time.sleep(delay + random.uniform(0, 0.1))
+        return wrapper
+    return decorator
+
+
 class PullZoneManager:
     """Manages Pull Zones on bunny.net."""
 
-    def __init__(self, client: BunnyClient):
+    def __init__(self, client: BunnyClient, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Args:
+            client: API client shared by all managers
+            max_workers: Maximum hostnames processed at once during sync_zone
+        """
         self.client = client
+        self.max_workers = max_workers
+        # (sync_zone result, zone id, hostname, force_ssl) awaiting
+        # flush_pending_certificates
+        self._pending_certificates: list[tuple[dict, int, str, Optional[bool]]] = []
 
     def list_zones(self) -> list[PullZone]:
-        """List all Pull Zones."""
+        """
+        List all Pull Zones.
+
+        The listing is served from the client's GET cache until a zone, one
+        of its hostnames or its edge rules change.
+        """
         response = self.client.get("/pullzone")
         items = response if isinstance(response, list) else []
         return [PullZone.from_api_response(z) for z in items]
@@ -192,10 +269,15 @@ class PullZoneManager:
         """Remove a custom hostname from a Pull Zone."""
         self.client.delete(f"/pullzone/{zone_id}/removeHostname", params={"hostname": hostname})
 
+    @_retries_status(500)
     def load_free_certificate(self, hostname: str) -> None:
         """Load a free SSL certificate for a hostname."""
-        self.client.get("/pullzone/loadFreeCertificate", params={"hostname": hostname})
+        self.client.get(
+            "/pullzone/loadFreeCertificate", params={"hostname": hostname}, cache=False
+        )
 
+    # POST is never retried by the transport, so gateway errors are retried here
+    @_retries_status(500, *TRANSIENT_STATUS_CODES)
     def set_force_ssl(self, zone_id: int, hostname: str, force: bool = True) -> None:
         """Enable or disable Force SSL for a hostname."""
         self.client.post(f"/pullzone/{zone_id}/setForceSSL", {
@@ -203,11 +285,90 @@ class PullZoneManager:
             "ForceSSL": force,
         })
 
+    def _add_and_secure_hostname(
+        self,
+        zone_id: int,
+        hostname: str,
+        force_ssl: Optional[bool],
+    ) -> tuple[Optional[Exception], Optional[Exception]]:
+        """
+        Add a hostname, then secure it with _secure_hostname.
+
+        Returns:
+            (certificate error, Force SSL error), each None on success
+        """
+        self.add_hostname(zone_id, hostname)
+        return self._secure_hostname(zone_id, hostname, force_ssl)
+
+    def _secure_hostname(
+        self,
+        zone_id: int,
+        hostname: str,
+        force_ssl: Optional[bool],
+    ) -> tuple[Optional[Exception], Optional[Exception]]:
+        """
+        Load a hostname's free certificate, then apply Force SSL.
+
+        The steps run in order because Force SSL needs the certificate.
+        Failures are returned rather than raised so the caller can report
+        them as warnings.
+
+        Returns:
+            (certificate error, Force SSL error), each None on success
+        """
+        cert_error = ssl_error = None
+        try:
+            self.load_free_certificate(hostname)
+        except Exception as e:
+            cert_error = e
+        if force_ssl is not None:
+            try:
+                self.set_force_ssl(zone_id, hostname, force=force_ssl)
+            except Exception as e:
+                ssl_error = e
+        return cert_error, ssl_error
+
+    @staticmethod
+    def _record_secured(
+        result: dict,
+        hostname: str,
+        force_ssl: Optional[bool],
+        outcome: tuple[Optional[Exception], Optional[Exception]],
+    ) -> None:
+        """Record a _secure_hostname outcome in a sync_zone result."""
+        cert_error, ssl_error = outcome
+        if cert_error is None:
+            result["certificates_loaded"].append(hostname)
+        else:
+            result["changes"].append(f"Warning: Could not load certificate for {hostname}: {cert_error}")
+        if force_ssl is not None:
+            if ssl_error is None:
+                state = "Enabled" if force_ssl else "Disabled"
+                result["changes"].append(f"{state} Force SSL for {hostname}")
+            else:
+                result["changes"].append(f"Warning: Could not set Force SSL for {hostname}: {ssl_error}")
+
+    def flush_pending_certificates(self) -> None:
+        """
+        Secure the hostnames queued by sync_zone(defer_certificates=True).
+
+        Certificates and Force SSL for every queued hostname, across all
+        zones, are requested concurrently; outcomes are recorded in the
+        result dict of the sync_zone call that queued them.
+        """
+        pending, self._pending_certificates = self._pending_certificates, []
+        outcomes = run_concurrently(
+            lambda entry: self._secure_hostname(*entry[1:]), pending, self.max_workers
+        )
+        for (result, _, hostname, force_ssl), outcome in zip(pending, outcomes):
+            self._record_secured(result, hostname, force_ssl, outcome)
+
     def sync_zone(
         self,
         name: str,
         config: dict,
         dry_run: bool = False,
+        defer_certificates: bool = False,
     ) -> dict:
         """
         Sync a Pull Zone to match desired configuration.
@@ -216,12 +377,15 @@ class PullZoneManager:
             name: Pull Zone name
             config: Configuration dict with origin_url, hostnames, etc.
             dry_run: If True, only report changes without making them
+            defer_certificates: If True, queue certificate loading and Force
+                SSL for added hostnames until flush_pending_certificates
 
         Returns:
             Dict with changes made
         """
         result = {
             "zone": name,
+            "zone_id": None,
             "created": False,
             "updated": False,
             "hostnames_added": [],
@@ -239,7 +403,16 @@ class PullZoneManager:
 
         # Parse enabled regions
         regions = config.get("enabled_regions", ["EU", "US", "ASIA", "SA", "AF"])
-        regions_upper = [r.upper() for r in regions]
+        regions_set = frozenset(r.upper() for r in regions)
+
+        # The zone settings sent on create or update
+        desired = PullZone(
+            name=name,
+            origin_url=origin_url,
+            origin_host_header=origin_host_header,
+            type=zone_type,
+            **{attr: code in regions_set for code, attr in _REGION_SPECS},
+        )
 
         # Get or create zone
         zone = self.get_zone_by_name(name)
@@ -247,63 +420,31 @@ class PullZoneManager:
             result["created"] = True
             result["changes"].append(f"Creating pull zone '{name}'")
             if not dry_run:
-                new_zone = PullZone(
-                    name=name,
-                    origin_url=origin_url,
-                    origin_host_header=origin_host_header,
-                    type=zone_type,
-                    enable_geo_zone_us="US" in regions_upper,
-                    enable_geo_zone_eu="EU" in regions_upper,
-                    enable_geo_zone_asia="ASIA" in regions_upper,
-                    enable_geo_zone_sa="SA" in regions_upper,
-                    enable_geo_zone_af="AF" in regions_upper,
-                )
-                zone = self.create_zone(new_zone)
-        else:
-            # Check if update needed
-            needs_update = False
+                zone = self.create_zone(desired)
+        elif not zone.matches(desired):
+            # Settings differ; report which ones before updating
+            result["updated"] = True
             if origin_url and zone.origin_url != origin_url:
-                needs_update = True
                 result["changes"].append(f"Updating origin URL: {zone.origin_url} -> {origin_url}")
             if origin_host_header and zone.origin_host_header != origin_host_header:
-                needs_update = True
                 result["changes"].append(f"Updating origin host header: {zone.origin_host_header} -> {origin_host_header}")
             if zone.type != zone_type:
-                needs_update = True
                 result["changes"].append(f"Updating zone type: {zone.type} -> {zone_type}")
 
             # Check region changes
-            region_changes = []
-            if zone.enable_geo_zone_us != ("US" in regions_upper):
-                region_changes.append(f"US: {zone.enable_geo_zone_us} -> {'US' in regions_upper}")
-            if zone.enable_geo_zone_eu != ("EU" in regions_upper):
-                region_changes.append(f"EU: {zone.enable_geo_zone_eu} -> {'EU' in regions_upper}")
-            if zone.enable_geo_zone_asia != ("ASIA" in regions_upper):
-                region_changes.append(f"ASIA: {zone.enable_geo_zone_asia} -> {'ASIA' in regions_upper}")
-            if zone.enable_geo_zone_sa != ("SA" in regions_upper):
-                region_changes.append(f"SA: {zone.enable_geo_zone_sa} -> {'SA' in regions_upper}")
-            if zone.enable_geo_zone_af != ("AF" in regions_upper):
-                region_changes.append(f"AF: {zone.enable_geo_zone_af} -> {'AF' in regions_upper}")
-
+            region_changes = [
+                f"{code}: {current} -> {wanted}"
+                for code, attr in _REGION_SPECS
+                if (current := getattr(zone, attr)) != (wanted := getattr(desired, attr))
+            ]
             if region_changes:
-                needs_update = True
                 result["changes"].append(f"Updating regions: {', '.join(region_changes)}")
 
-            if needs_update:
-                result["updated"] = True
-                if not dry_run:
-                    updated_zone = PullZone(
-                        name=name,
-                        origin_url=origin_url,
-                        origin_host_header=origin_host_header,
-                        type=zone_type,
-                        enable_geo_zone_us="US" in regions_upper,
-                        enable_geo_zone_eu="EU" in regions_upper,
-                        enable_geo_zone_asia="ASIA" in regions_upper,
-                        enable_geo_zone_sa="SA" in regions_upper,
-                        enable_geo_zone_af="AF" in regions_upper,
-                    )
-                    zone = self.update_zone(zone.id, updated_zone)
+            if not dry_run:
+                zone = self.update_zone(zone.id, desired)
+
+        if zone is not None:
+            result["zone_id"] = zone.id
 
         # Sync hostnames
         # In dry-run mode for new zones, zone is None - skip hostname sync but report planned additions
@@ -314,69 +455,94 @@ class PullZoneManager:
             return result
 
         current_hostnames = {
-            h.value.lower(): h
+            _name_key(h.value): h
             for h in zone.hostnames
             if not h.is_system_hostname
         }
-        desired_hostnames_lower = {h.lower() for h in desired_hostnames}
-
-        # Add missing hostnames
+        # Route each desired hostname to the work it needs in a single pass
+        desired_hostnames_lower = set()
+        to_add, to_certify, to_force = [], [], []
         for hostname in desired_hostnames:
-            if hostname.lower() not in current_hostnames:
-                result["hostnames_added"].append(hostname)
-                result["changes"].append(f"Adding hostname: {hostname}")
-                if not dry_run:
-                    self.add_hostname(zone.id, hostname)
-                    # Load free certificate
-                    try:
-                        self.load_free_certificate(hostname)
-                        result["certificates_loaded"].append(hostname)
-                    except Exception as e:
-                        result["changes"].append(f"Warning: Could not load certificate for {hostname}: {e}")
-                    # Set Force SSL if configured
-                    if force_ssl is not None:
-                        try:
-                            self.set_force_ssl(zone.id, hostname, force=force_ssl)
-                            state = "Enabled" if force_ssl else "Disabled"
-                            result["changes"].append(f"{state} Force SSL for {hostname}")
-                        except Exception as e:
-                            result["changes"].append(f"Warning: Could not set Force SSL for {hostname}: {e}")
+            hostname_lower = _name_key(hostname)
+            desired_hostnames_lower.add(hostname_lower)
+            hostname_obj = current_hostnames.get(hostname_lower)
+            if hostname_obj is None:
+                to_add.append(hostname)
+                continue
+            if not hostname_obj.has_certificate:
+                to_certify.append(hostname)
+            if force_ssl is not None and hostname_obj.force_ssl != force_ssl:
+                to_force.append(hostname)
+
+        # Each hostname's calls are independent of the others', so every
+        # phase below fans out concurrently and records outcomes in order.
+
+        # Add missing hostnames, chaining certificate and Force SSL per hostname
+        if dry_run:
+            outcomes = [None] * len(to_add)
+        elif defer_certificates:
+            added = run_concurrently(
+                partial(self.add_hostname, zone.id), to_add, self.max_workers, return_exceptions=True
+            )
+            # Queue every hostname that made it onto the zone before surfacing
+            # a failed add, so the flush still secures them
+            self._pending_certificates.extend(
+                (result, zone.id, hostname, force_ssl)
+                for hostname, outcome in zip(to_add, added)
+                if not isinstance(outcome, Exception)
+            )
+            for outcome in added:
+                if isinstance(outcome, Exception):
+                    raise outcome
+            outcomes = [None] * len(to_add)
+        else:
+            add_one = partial(self._add_and_secure_hostname, zone.id, force_ssl=force_ssl)
+            outcomes = run_concurrently(add_one, to_add, self.max_workers)
+        for hostname, outcome in zip(to_add, outcomes):
+            result["hostnames_added"].append(hostname)
+            result["changes"].append(f"Adding hostname: {hostname}")
+            if outcome is not None:
+                self._record_secured(result, hostname, force_ssl, outcome)
 
         # Retry loading certificates for existing hostnames that don't have one
-        for hostname in desired_hostnames:
-            hostname_lower = hostname.lower()
-            if hostname_lower in current_hostnames:
-                hostname_obj = current_hostnames[hostname_lower]
-                if not hostname_obj.has_certificate:
-                    result["changes"].append(f"Loading certificate for {hostname}")
-                    if not dry_run:
-                        try:
-                            self.load_free_certificate(hostname)
-                            result["certificates_loaded"].append(hostname)
-                        except Exception as e:
-                            result["changes"].append(f"Warning: Could not load certificate for {hostname}: {e}")
+        if dry_run:
+            outcomes = [None] * len(to_certify)
+        else:
+            outcomes = run_concurrently(
+                self.load_free_certificate, to_certify, self.max_workers, return_exceptions=True
+            )
+        for hostname, outcome in zip(to_certify, outcomes):
+            result["changes"].append(f"Loading certificate for {hostname}")
+            if dry_run:
+                continue
+            if isinstance(outcome, Exception):
+                result["changes"].append(f"Warning: Could not load certificate for {hostname}: {outcome}")
+            else:
+                result["certificates_loaded"].append(hostname)
 
         # Set Force SSL for existing hostnames where state doesn't match
-        if force_ssl is not None:
-            for hostname in desired_hostnames:
-                hostname_lower = hostname.lower()
-                if hostname_lower in current_hostnames:
-                    hostname_obj = current_hostnames[hostname_lower]
-                    if hostname_obj.force_ssl != force_ssl:
-                        state = "Enabling" if force_ssl else "Disabling"
-                        result["changes"].append(f"{state} Force SSL for {hostname}")
-                        if not dry_run:
-                            try:
-                                self.set_force_ssl(zone.id, hostname, force=force_ssl)
-                            except Exception as e:
-                                result["changes"].append(f"Warning: Could not set Force SSL for {hostname}: {e}")
+        if to_force:
+            if dry_run:
+                outcomes = [None] * len(to_force)
+            else:
+                set_one = partial(self.set_force_ssl, zone.id, force=force_ssl)
+                outcomes = run_concurrently(set_one, to_force, self.max_workers, return_exceptions=True)
+            state = "Enabling" if force_ssl else "Disabling"
+            for hostname, outcome in zip(to_force, outcomes):
+                result["changes"].append(f"{state} Force SSL for {hostname}")
+                if isinstance(outcome, Exception):
+                    result["changes"].append(f"Warning: Could not set Force SSL for {hostname}: {outcome}")
 
         # Remove extra hostnames
-        for hostname_lower, hostname_obj in current_hostnames.items():
-            if hostname_lower not in desired_hostnames_lower:
-                result["hostnames_removed"].append(hostname_obj.value)
-                result["changes"].append(f"Removing hostname: {hostname_obj.value}")
-                if not dry_run:
-                    self.remove_hostname(zone.id, hostname_obj.value)
+        to_remove = [
+            hostname_obj.value
+            for hostname_lower, hostname_obj in current_hostnames.items()
+            if hostname_lower not in desired_hostnames_lower
+        ]
+        for hostname in to_remove:
+            result["hostnames_removed"].append(hostname)
+            result["changes"].append(f"Removing hostname: {hostname}")
+        if not dry_run:
+            run_concurrently(partial(self.remove_hostname, zone.id), to_remove, self.max_workers)
 
         return result
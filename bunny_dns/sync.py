@@ -2,25 +2,51 @@
 Main orchestrator for syncing bunny.net configuration.
 """
 
-import json
+import sys
+import threading
+from functools import partial
 from pathlib import Path
 from typing import Any, Optional, Union
 
+from . import jsonlib
 from .bunny_client import BunnyClient
+from .concurrency import DEFAULT_MAX_WORKERS, run_concurrently
 from .dns_manager import DNSManager
 from .pullzone_manager import PullZoneManager
 from .edge_rules_manager import EdgeRulesManager
 
+# Seconds the shared client reuses GET responses during a sync. A sync reads
+# the same listings many times and invalidates them on its own writes.
+SYNC_CACHE_TTL = 60.0
+
 
 class BunnySync:
     """Orchestrates syncing DNS zones, Pull Zones, and Edge Rules."""
 
-    def __init__(self, api_key: str):
-        self.client = BunnyClient(api_key)
+    def __init__(self, api_key: str, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Args:
+            api_key: Your bunny.net API key (AccessKey)
+            max_workers: Maximum domains, pull zones per domain or exports
+                processed at once
+        """
+        self.max_workers = max_workers
+        # One client, and so one connection pool, shared by every manager
+        self.client = BunnyClient(api_key, cache_ttl=SYNC_CACHE_TTL)
         self.dns_manager = DNSManager(self.client)
         self.pullzone_manager = PullZoneManager(self.client)
         self.edge_rules_manager = EdgeRulesManager(self.client)
 
+    def close(self) -> None:
+        """Release the shared API client's connections."""
+        self.client.close()
+
+    def __enter__(self) -> "BunnySync":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def load_config(self, config: Union[dict, str, Path]) -> dict:
         """
         Load configuration from dict, JSON string, or file path.
@@ -33,12 +59,16 @@ class BunnySync:
         """
         if isinstance(config, dict):
             return config
-        elif isinstance(config, Path) or (isinstance(config, str) and Path(config).exists()):
-            path = Path(config)
-            with open(path) as f:
-                return json.load(f)
+        elif isinstance(config, Path):
+            return jsonlib.loads(config.read_bytes())
         elif isinstance(config, str):
-            return json.loads(config)
+            # Inline JSON is recognizable without touching the filesystem
+            if config.lstrip()[:1] in ("{", "["):
+                return jsonlib.loads(config)
+            path = Path(config)
+            if path.exists():
+                return jsonlib.loads(path.read_bytes())
+            return jsonlib.loads(config)
         else:
             raise ValueError(f"Invalid config type: {type(config)}")
 
@@ -46,12 +76,14 @@ class BunnySync:
         """Filter domains config by domain name if filter is specified."""
         if domain_filter is None:
             return domains_config
-        # Match exact domain or allow wildcard matching
-        filtered = {}
+        # Exact hit first; otherwise fall back to a case-insensitive match
+        if domain_filter in domains_config:
+            return {domain_filter: domains_config[domain_filter]}
+        filter_lower = domain_filter.lower()
         for domain, config in domains_config.items():
-            if domain.lower() == domain_filter.lower():
-                filtered[domain] = config
-        return filtered
+            if domain.lower() == filter_lower:
+                return {domain: config}
+        return {}
 
     def sync(
         self,
@@ -72,24 +104,73 @@ class BunnySync:
         Returns:
             Dict with all sync results
         """
-        config_data = self.load_config(config)
-        results = {
-            "dry_run": dry_run,
-            "domain_filter": domain,
-            "dns_zones": [],
-            "pull_zones": [],
-            "summary": {
-                "dns_records_created": 0,
-                "dns_records_updated": 0,
-                "dns_records_deleted": 0,
-                "pull_zones_created": 0,
-                "pull_zones_updated": 0,
-                "hostnames_added": 0,
-                "hostnames_removed": 0,
-                "edge_rules_created": 0,
-                "edge_rules_deleted": 0,
-            },
+        results = self._sync_core(
+            config,
+            dry_run=dry_run,
+            delete_extra_records=delete_extra_records,
+            domain=domain,
+            do_dns=True,
+            do_pullzones=True,
+            do_edge_rules=True,
+        )
+
+        summary = {
+            "dns_records_created": 0,
+            "dns_records_updated": 0,
+            "dns_records_deleted": 0,
+            "pull_zones_created": 0,
+            "pull_zones_updated": 0,
+            "hostnames_added": 0,
+            "hostnames_removed": 0,
+            "edge_rules_created": 0,
+            "edge_rules_deleted": 0,
         }
+        for dns_result in results["dns_zones"]:
+            summary["dns_records_created"] += len(dns_result.get("created", []))
+            summary["dns_records_updated"] += len(dns_result.get("updated", []))
+            summary["dns_records_deleted"] += len(dns_result.get("deleted", []))
+        for pz_result in results["pull_zones"]:
+            if pz_result.get("created"):
+                summary["pull_zones_created"] += 1
+            if pz_result.get("updated"):
+                summary["pull_zones_updated"] += 1
+            summary["hostnames_added"] += len(pz_result.get("hostnames_added", []))
+            summary["hostnames_removed"] += len(pz_result.get("hostnames_removed", []))
+            er_result = pz_result.get("edge_rules")
+            if er_result:
+                summary["edge_rules_created"] += len(er_result.get("created", []))
+                summary["edge_rules_deleted"] += len(er_result.get("deleted", []))
+        results["summary"] = summary
+
+        return results
+
+    def _sync_core(
+        self,
+        config: Union[dict, str, Path],
+        dry_run: bool,
+        delete_extra_records: bool,
+        domain: Optional[str],
+        do_dns: bool,
+        do_pullzones: bool,
+        do_edge_rules: bool,
+    ) -> dict:
+        """
+        Shared body of sync, sync_dns_only and sync_pullzones_only.
+
+        Args:
+            config: Configuration dict, JSON string, or path to JSON file
+            dry_run: If True, only report changes without making them
+            delete_extra_records: If True, delete DNS records not in config
+            domain: If specified, only sync this domain
+            do_dns: Sync DNS records
+            do_pullzones: Sync Pull Zones
+            do_edge_rules: Sync each Pull Zone's Edge Rules
+
+        Returns:
+            Dict with "dns_zones" and/or "pull_zones" results, as enabled
+        """
+        config_data = self.load_config(config)
+        results = {"dry_run": dry_run, "domain_filter": domain}
 
         # Get domains config and apply filter
         domains_config = config_data.get("domains", {})
@@ -98,57 +179,159 @@ class BunnySync:
         if domain and not domains_config:
             raise ValueError(f"Domain '{domain}' not found in configuration")
 
-        # Process each domain
-        for domain_name, domain_config in domains_config.items():
-            # Sync DNS records for this domain
-            dns_records = domain_config.get("dns_records", [])
-            if dns_records:
-                result = self.dns_manager.sync_zone(
-                    domain=domain_name,
-                    desired_records=dns_records,
-                    dry_run=dry_run,
-                    delete_extra=delete_extra_records,
-                )
-                results["dns_zones"].append(result)
-                results["summary"]["dns_records_created"] += len(result.get("created", []))
-                results["summary"]["dns_records_updated"] += len(result.get("updated", []))
-                results["summary"]["dns_records_deleted"] += len(result.get("deleted", []))
-
-            # Sync Pull Zones for this domain
-            pull_zones_config = domain_config.get("pull_zones", {})
-            for pz_name, pz_config in pull_zones_config.items():
-                # Sync the pull zone itself
-                pz_result = self.pullzone_manager.sync_zone(
-                    name=pz_name,
-                    config=pz_config,
+        # Domains with nothing to sync in this mode never reach the pool
+        work = [
+            (domain_name, domain_config)
+            for domain_name, domain_config in domains_config.items()
+            if (do_dns and domain_config.get("dns_records"))
+            or (do_pullzones and domain_config.get("pull_zones"))
+        ]
+
+        # Domains are independent, so they sync concurrently; each domain's
+        # DNS, pull zone and edge rule steps still run in order
+        sync_domain = partial(
+            self._sync_domain,
+            dry_run=dry_run,
+            delete_extra_records=delete_extra_records,
+            do_dns=do_dns,
+            do_pullzones=do_pullzones,
+            do_edge_rules=do_edge_rules,
+        )
+        failed = threading.Event()
+
+        def sync_one(item: tuple[str, dict]) -> Optional[tuple[Optional[dict], list[dict]]]:
+            # Like a serial run, stop at the first failing domain: domains
+            # already in flight finish, but no new ones are started
+            if failed.is_set():
+                return None
+            try:
+                return sync_domain(item)
+            except Exception:
+                failed.set()
+                raise
+
+        domain_results = run_concurrently(
+            sync_one, work, self.max_workers, return_exceptions=True
+        )
+
+        if do_pullzones:
+            # Certificates for new hostnames are requested together once every
+            # domain's DNS records and pull zones are in place. This runs even
+            # if a domain failed, so hostnames already added elsewhere are
+            # still secured and nothing stays queued for a later sync.
+            self.pullzone_manager.flush_pending_certificates()
+
+        for outcome in domain_results:
+            if isinstance(outcome, Exception):
+                raise outcome
+
+        # Merge in config order
+        if do_dns:
+            results["dns_zones"] = [
+                dns_result for dns_result, _ in domain_results if dns_result is not None
+            ]
+        if do_pullzones:
+            results["pull_zones"] = [
+                pz_result for _, pz_results in domain_results for pz_result in pz_results
+            ]
+
+        return results
+
+    def _sync_domain(
+        self,
+        item: tuple[str, dict],
+        dry_run: bool,
+        delete_extra_records: bool,
+        do_dns: bool = True,
+        do_pullzones: bool = True,
+        do_edge_rules: bool = True,
+    ) -> tuple[Optional[dict], list[dict]]:
+        """
+        Sync one domain's DNS records, Pull Zones and Edge Rules.
+
+        Args:
+            item: (domain name, domain config) pair
+            dry_run: If True, only report changes without making them
+            delete_extra_records: If True, delete DNS records not in config
+            do_dns: Sync DNS records
+            do_pullzones: Sync Pull Zones
+            do_edge_rules: Sync each Pull Zone's Edge Rules
+
+        Returns:
+            (DNS sync result or None if no records configured, Pull Zone results)
+        """
+        domain_name, domain_config = item
+
+        # Sync DNS records for this domain
+        dns_result = None
+        dns_records = domain_config.get("dns_records", []) if do_dns else None
+        if dns_records:
+            dns_result = self.dns_manager.sync_zone(
+                domain=domain_name,
+                desired_records=dns_records,
+                dry_run=dry_run,
+                delete_extra=delete_extra_records,
+            )
+
+        # Sync Pull Zones for this domain. They are independent of each other,
+        # so they sync concurrently; results keep config order.
+        pull_zones_config = domain_config.get("pull_zones", {}) if do_pullzones else {}
+        sync_one = partial(
+            self._sync_pull_zone,
+            domain_name=domain_name,
+            dry_run=dry_run,
+            do_edge_rules=do_edge_rules,
+        )
+        pz_results = run_concurrently(sync_one, pull_zones_config.items(), self.max_workers)
+
+        return dns_result, pz_results
+
+    def _sync_pull_zone(
+        self,
+        item: tuple[str, dict],
+        domain_name: str,
+        dry_run: bool,
+        do_edge_rules: bool = True,
+    ) -> dict:
+        """
+        Sync one Pull Zone, then its Edge Rules.
+
+        Args:
+            item: (pull zone name, pull zone config) pair
+            domain_name: Domain the pull zone is configured under
+            dry_run: If True, only report changes without making them
+            do_edge_rules: Sync the Pull Zone's Edge Rules
+
+        Returns:
+            Pull Zone sync result, with "edge_rules" if they were synced
+        """
+        pz_name, pz_config = item
+
+        # Sync the pull zone itself
+        pz_result = self.pullzone_manager.sync_zone(
+            name=pz_name,
+            config=pz_config,
+            dry_run=dry_run,
+            defer_certificates=True,
+        )
+        pz_result["domain"] = domain_name
+
+        # Sync edge rules for this pull zone
+        edge_rules_config = pz_config.get("edge_rules", []) if do_edge_rules else None
+        if edge_rules_config:
+            # sync_zone reports the zone ID; look it up only if it didn't
+            zone_id = pz_result.get("zone_id")
+            if zone_id is None:
+                zone = self.pullzone_manager.get_zone_by_name(pz_name)
+                zone_id = zone.id if zone else None
+            if zone_id is not None:
+                pz_result["edge_rules"] = self.edge_rules_manager.sync_rules(
+                    zone_id=zone_id,
+                    rule_configs=edge_rules_config,
                     dry_run=dry_run,
                 )
-                pz_result["domain"] = domain_name
-                results["pull_zones"].append(pz_result)
-
-                if pz_result.get("created"):
-                    results["summary"]["pull_zones_created"] += 1
-                if pz_result.get("updated"):
-                    results["summary"]["pull_zones_updated"] += 1
-                results["summary"]["hostnames_added"] += len(pz_result.get("hostnames_added", []))
-                results["summary"]["hostnames_removed"] += len(pz_result.get("hostnames_removed", []))
-
-                # Sync edge rules for this pull zone
-                edge_rules_config = pz_config.get("edge_rules", [])
-                if edge_rules_config:
-                    # Get the pull zone ID
-                    zone = self.pullzone_manager.get_zone_by_name(pz_name)
-                    if zone:
-                        er_result = self.edge_rules_manager.sync_rules(
-                            zone_id=zone.id,
-                            rule_configs=edge_rules_config,
-                            dry_run=dry_run,
-                        )
-                        pz_result["edge_rules"] = er_result
-                        results["summary"]["edge_rules_created"] += len(er_result.get("created", []))
-                        results["summary"]["edge_rules_deleted"] += len(er_result.get("deleted", []))
 
-        return results
+        return pz_result
 
     def sync_dns_only(
         self,
@@ -158,27 +341,15 @@ class BunnySync:
         domain: Optional[str] = None,
     ) -> dict:
         """Sync only DNS zones."""
-        config_data = self.load_config(config)
-        results = {"dry_run": dry_run, "domain_filter": domain, "dns_zones": []}
-
-        domains_config = config_data.get("domains", {})
-        domains_config = self._filter_domains(domains_config, domain)
-
-        if domain and not domains_config:
-            raise ValueError(f"Domain '{domain}' not found in configuration")
-
-        for domain_name, domain_config in domains_config.items():
-            dns_records = domain_config.get("dns_records", [])
-            if dns_records:
-                result = self.dns_manager.sync_zone(
-                    domain=domain_name,
-                    desired_records=dns_records,
-                    dry_run=dry_run,
-                    delete_extra=delete_extra_records,
-                )
-                results["dns_zones"].append(result)
-
-        return results
+        return self._sync_core(
+            config,
+            dry_run=dry_run,
+            delete_extra_records=delete_extra_records,
+            domain=domain,
+            do_dns=True,
+            do_pullzones=False,
+            do_edge_rules=False,
+        )
 
     def pull(
         self,
@@ -233,9 +404,12 @@ class BunnySync:
         if not dns_only:
             pull_zones = {}
             pz_list = self.pullzone_manager.get_zones_for_domain(domain)
-            for pz in pz_list:
+            pz_rules = run_concurrently(
+                self.edge_rules_manager.export_rules, [pz.id for pz in pz_list], self.max_workers
+            )
+            for pz, rules in zip(pz_list, pz_rules):
                 pz_config = pz.to_config_dict()
-                pz_config["edge_rules"] = self.edge_rules_manager.export_rules(pz.id)
+                pz_config["edge_rules"] = rules
                 pull_zones[pz.name] = pz_config
             domain_config["pull_zones"] = pull_zones
 
@@ -266,20 +440,29 @@ class BunnySync:
                 z.domain for z in self.dns_manager.list_zones()
             ]
 
-            for pz in all_pz:
+            # Each zone's rules are a separate request; fetch them concurrently
+            all_rules = run_concurrently(
+                self.edge_rules_manager.export_rules, [pz.id for pz in all_pz], self.max_workers
+            )
+            # Index domains by their reversed labels so a hostname is matched
+            # by walking its own suffixes, longest (most specific) first
+            domains_by_labels = {}
+            for d in dns_domains:
+                domains_by_labels.setdefault(tuple(reversed(d.lower().split("."))), d)
+
+            for pz, rules in zip(all_pz, all_rules):
                 pz_config = pz.to_config_dict()
-                pz_config["edge_rules"] = self.edge_rules_manager.export_rules(pz.id)
+                pz_config["edge_rules"] = rules
 
                 # Find matching domain by hostname
                 matched_domain = None
                 for h in pz.hostnames:
                     if h.is_system_hostname:
                         continue
-                    h_lower = h.value.lower()
-                    for d in dns_domains:
-                        d_lower = d.lower()
-                        if h_lower == d_lower or h_lower.endswith("." + d_lower):
-                            matched_domain = d
+                    labels = tuple(reversed(h.value.lower().split(".")))
+                    for i in range(len(labels), 0, -1):
+                        matched_domain = domains_by_labels.get(labels[:i])
+                        if matched_domain:
                             break
                     if matched_domain:
                         break
@@ -288,7 +471,6 @@ class BunnySync:
                     domains.setdefault(matched_domain, {})
                     domains[matched_domain].setdefault("pull_zones", {})[pz.name] = pz_config
                 else:
-                    import sys
                     print(
                         f"Warning: Pull zone '{pz.name}' could not be matched to any domain",
                         file=sys.stderr,
@@ -307,91 +489,97 @@ class BunnySync:
         domain: Optional[str] = None,
     ) -> dict:
         """Sync only Pull Zones (without edge rules)."""
-        config_data = self.load_config(config)
-        results = {"dry_run": dry_run, "domain_filter": domain, "pull_zones": []}
-
-        domains_config = config_data.get("domains", {})
-        domains_config = self._filter_domains(domains_config, domain)
-
-        if domain and not domains_config:
-            raise ValueError(f"Domain '{domain}' not found in configuration")
+        return self._sync_core(
+            config,
+            dry_run=dry_run,
+            delete_extra_records=False,
+            domain=domain,
+            do_dns=False,
+            do_pullzones=True,
+            do_edge_rules=False,
+        )
 
-        for domain_name, domain_config in domains_config.items():
-            pull_zones_config = domain_config.get("pull_zones", {})
-            for pz_name, pz_config in pull_zones_config.items():
-                result = self.pullzone_manager.sync_zone(
-                    name=pz_name,
-                    config=pz_config,
-                    dry_run=dry_run,
-                )
-                result["domain"] = domain_name
-                results["pull_zones"].append(result)
 
-        return results
+# Underline for report section headings
+_RULE = "-" * 40
 
 
 def print_results(results: dict) -> None:
     """Print sync results in a human-readable format."""
+    # Collected and written once; a report can run to hundreds of lines
+    lines = []
+    out = lines.append
     if results.get("dry_run"):
-        print("=== DRY RUN MODE (no changes made) ===\n")
+        out("=== DRY RUN MODE (no changes made) ===\n")
     if results.get("domain_filter"):
-        print(f"=== Syncing domain: {results['domain_filter']} ===\n")
+        out(f"=== Syncing domain: {results['domain_filter']} ===\n")
 
     # DNS Zones
-    if results.get("dns_zones"):
-        print("DNS ZONES:")
-        print("-" * 40)
-        for zone in results["dns_zones"]:
-            print(f"\n  {zone['zone']}:")
+    dns_zones = results.get("dns_zones")
+    if dns_zones:
+        out("DNS ZONES:")
+        out(_RULE)
+        for zone in dns_zones:
+            out(f"\n  {zone['zone']}:")
             if zone.get("zone_created"):
-                print("    [NEW ZONE CREATED]")
-            if zone.get("created"):
-                print(f"    Created: {len(zone['created'])} records")
-                for rec in zone["created"]:
-                    print(f"      + {rec}")
-            if zone.get("updated"):
-                print(f"    Updated: {len(zone['updated'])} records")
-                for rec in zone["updated"]:
-                    print(f"      ~ {rec}")
-            if zone.get("deleted"):
-                print(f"    Deleted: {len(zone['deleted'])} records")
-                for rec in zone["deleted"]:
-                    print(f"      - {rec}")
-            if zone.get("unchanged"):
-                print(f"    Unchanged: {len(zone['unchanged'])} records")
+                out("    [NEW ZONE CREATED]")
+            created = zone.get("created")
+            if created:
+                out(f"    Created: {len(created)} records")
+                for rec in created:
+                    out(f"      + {rec}")
+            updated = zone.get("updated")
+            if updated:
+                out(f"    Updated: {len(updated)} records")
+                for rec in updated:
+                    out(f"      ~ {rec}")
+            deleted = zone.get("deleted")
+            if deleted:
+                out(f"    Deleted: {len(deleted)} records")
+                for rec in deleted:
+                    out(f"      - {rec}")
+            unchanged = zone.get("unchanged")
+            if unchanged:
+                out(f"    Unchanged: {len(unchanged)} records")
 
     # Pull Zones
-    if results.get("pull_zones"):
-        print("\nPULL ZONES:")
-        print("-" * 40)
-        for zone in results["pull_zones"]:
-            print(f"\n  {zone['zone']}:")
+    pull_zones = results.get("pull_zones")
+    if pull_zones:
+        out("\nPULL ZONES:")
+        out(_RULE)
+        for zone in pull_zones:
+            out(f"\n  {zone['zone']}:")
             if zone.get("created"):
-                print("    [NEW ZONE CREATED]")
+                out("    [NEW ZONE CREATED]")
             if zone.get("updated"):
-                print("    [ZONE UPDATED]")
+                out("    [ZONE UPDATED]")
             for change in zone.get("changes", []):
-                print(f"    {change}")
-            if zone.get("edge_rules"):
-                er = zone["edge_rules"]
-                if er.get("deleted"):
-                    print(f"    Edge rules deleted: {len(er['deleted'])}")
-                if er.get("created"):
-                    print(f"    Edge rules created: {len(er['created'])}")
-                    for rule in er["created"]:
-                        print(f"      + {rule}")
+                out(f"    {change}")
+            er = zone.get("edge_rules")
+            if er:
+                deleted = er.get("deleted")
+                if deleted:
+                    out(f"    Edge rules deleted: {len(deleted)}")
+                created = er.get("created")
+                if created:
+                    out(f"    Edge rules created: {len(created)}")
+                    for rule in created:
+                        out(f"      + {rule}")
 
     # Summary
-    if results.get("summary"):
-        s = results["summary"]
-        print("\nSUMMARY:")
-        print("-" * 40)
-        print(f"  DNS records: {s['dns_records_created']} created, "
-              f"{s['dns_records_updated']} updated, "
-              f"{s['dns_records_deleted']} deleted")
-        print(f"  Pull zones: {s['pull_zones_created']} created, "
-              f"{s['pull_zones_updated']} updated")
-        print(f"  Hostnames: {s['hostnames_added']} added, "
-              f"{s['hostnames_removed']} removed")
-        print(f"  Edge rules: {s['edge_rules_created']} created, "
-              f"{s['edge_rules_deleted']} deleted")
+    s = results.get("summary")
+    if s:
+        out("\nSUMMARY:")
+        out(_RULE)
+        out(f"  DNS records: {s['dns_records_created']} created, "
+            f"{s['dns_records_updated']} updated, "
+            f"{s['dns_records_deleted']} deleted")
+        out(f"  Pull zones: {s['pull_zones_created']} created, "
+            f"{s['pull_zones_updated']} updated")
+        out(f"  Hostnames: {s['hostnames_added']} added, "
+            f"{s['hostnames_removed']} removed")
+        out(f"  Edge rules: {s['edge_rules_created']} created, "
+            f"{s['edge_rules_deleted']} deleted")
+
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -2,40 +2,88 @@
 Shared fixtures for bunny-dns tests.
 """
 
-from unittest.mock import MagicMock, Mock
+import json
+from unittest.mock import Mock
 
 import pytest
+import requests
 
 from bunny_dns.bunny_client import BunnyClient
 
 
+# Attributes of a real response, including those set in Response.__init__
+_RESPONSE_ATTRS = dir(requests.Response())
+
+
+class _StubSession:
+    """The parts of requests.Session that BunnyClient uses, with mocked calls."""
+
+    def __init__(self):
+        self.headers = {}
+        self.request = Mock()
+        self.close = Mock()
+
+
 @pytest.fixture
 def mock_session():
     """Create a mock requests session."""
-    return MagicMock()
+    return _StubSession()
 
 
 @pytest.fixture
 def mock_client(mock_session):
-    """Create a BunnyClient with mocked session."""
-    client = BunnyClient(api_key="test-api-key")
-    client.session = mock_session
-    return client
+    """Create a BunnyClient with mocked session, caching GETs as BunnySync does."""
+    return BunnyClient(api_key="test-api-key", session=mock_session, cache_ttl=60.0)
 
 
 @pytest.fixture
 def mock_response():
     """Factory fixture for creating mock responses."""
-    def _create_response(status_code=200, json_data=None, text=""):
-        response = Mock()
+    def _create_response(status_code=200, json_data=None, text="", headers=None):
+        response = Mock(spec_set=_RESPONSE_ATTRS)
         response.status_code = status_code
-        response.text = text if text else (str(json_data) if json_data else "")
+        response.text = text if text else (json.dumps(json_data) if json_data else "")
+        response.content = response.text.encode()
         response.json = Mock(return_value=json_data)
+        response.headers = headers or {}
         return response
     return _create_response
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def mock_response_no_json():
+    """Factory fixture for mock responses whose body is not JSON."""
+    def _create_response(status_code=204, text=""):
+        response = Mock(spec_set=_RESPONSE_ATTRS)
+        response.status_code = status_code
+        response.text = text
+        response.content = text.encode()
+        response.json = Mock(side_effect=ValueError("No JSON"))
+        response.headers = {}
+        return response
+    return _create_response
+
+
+@pytest.fixture(scope="module")
+def canned_success_response():
+    """A 200 response with body {"result": "ok"}, shared within a module.
+
+    The client only reads a response, so tests may reuse one instance.
+    """
+    response = Mock(spec_set=_RESPONSE_ATTRS)
+    response.status_code = 200
+    response.text = '{"result": "ok"}'
+    response.content = response.text.encode()
+    response.json = Mock(return_value={"result": "ok"})
+    response.headers = {}
+    return response
+
+
+# The sample_* payloads below are built once per session and shared, so
+# tests must treat them as read-only.
+
+
+@pytest.fixture(scope="session")
 def sample_dns_zone_response():
     """Sample DNS zone response from API."""
     return {
@@ -76,7 +124,7 @@ def sample_dns_zone_response():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_pullzone_response():
     """Sample Pull Zone response from API."""
     return {
@@ -111,7 +159,7 @@ def sample_pullzone_response():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_edge_rule_response():
     """Sample Edge Rule response from API."""
     return {
@@ -133,7 +181,7 @@ def sample_edge_rule_response():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_config():
     """Sample configuration for testing."""
     return {
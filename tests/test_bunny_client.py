@@ -2,10 +2,14 @@
 Tests for bunny_client.py - HTTP client with authentication and retry logic.
 """
 
+import threading
 import time
-from unittest.mock import Mock, patch
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import Mock, call, patch
 
 import pytest
+import requests
 
 from bunny_dns.bunny_client import (
     BunnyClient,
@@ -15,92 +19,150 @@ from bunny_dns.bunny_client import (
     BunnyNotFoundError,
     BunnyRateLimitError,
     BunnyValidationError,
+    DEFAULT_TIMEOUT,
+    parse_retry_after,
 )
+from bunny_dns.concurrency import run_concurrently
 
 
-class TestBunnyClientInit:
-    """Test BunnyClient initialization."""
-
-    def test_init_sets_api_key(self):
-        client = BunnyClient("my-api-key")
-        assert client.api_key == "my-api-key"
+# Expected session.request calls for the /test endpoint
+EXPECTED_GET = call(
+    method="GET",
+    url="https://api.bunny.net/test",
+    params=None,
+    json=None,
+    timeout=DEFAULT_TIMEOUT,
+)
+EXPECTED_GET_WITH_PARAMS = call(
+    method="GET",
+    url="https://api.bunny.net/test",
+    params={"key": "value"},
+    json=None,
+    timeout=DEFAULT_TIMEOUT,
+)
+EXPECTED_POST_WITH_JSON = call(
+    method="POST",
+    url="https://api.bunny.net/test",
+    params=None,
+    json={"name": "test"},
+    timeout=DEFAULT_TIMEOUT,
+)
 
-    def test_init_sets_default_retries(self):
-        client = BunnyClient("key")
-        assert client.max_retries == 3
-        assert client.retry_delay == 1.0
 
-    def test_init_sets_custom_retries(self):
-        client = BunnyClient("key", max_retries=5, retry_delay=2.0)
-        assert client.max_retries == 5
-        assert client.retry_delay == 2.0
+class TestBunnyClientInit:
+    """Test BunnyClient initialization."""
 
-    def test_init_sets_headers(self):
-        client = BunnyClient("test-key")
-        assert client.session.headers["AccessKey"] == "test-key"
-        assert client.session.headers["Content-Type"] == "application/json"
-        assert client.session.headers["Accept"] == "application/json"
+    def test_init_attributes(self):
+        default = BunnyClient("test-key")
+        assert default.api_key == "test-key"
+        assert (default.max_retries, default.retry_delay) == (3, 1.0)
+        assert default.cache_ttl == 0
+        assert default.session.headers["AccessKey"] == "test-key"
+        assert default.session.headers["Content-Type"] == "application/json"
+        assert default.session.headers["Accept"] == "application/json"
+
+        custom = BunnyClient("key", max_retries=5, retry_delay=2.0)
+        assert (custom.max_retries, custom.retry_delay) == (5, 2.0)
+
+    def test_caps_requests_in_flight(self, mock_response):
+        session = Mock(headers={})
+        client = BunnyClient("key", session=session, max_concurrent_requests=3)
+        response = mock_response(200, {"ok": True})
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def request(**kwargs):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.pop()
+            return response
+
+        session.request.side_effect = request
+
+        run_concurrently(lambda i: client.post(f"/pullzone/{i}"), range(20), max_workers=20)
+
+        assert session.request.call_count == 20
+        assert max(peak) == 3
+
+    def test_init_uses_given_session(self):
+        session = requests.Session()
+        client = BunnyClient("key", session=session)
+        assert client.session is session
+        assert session.headers["AccessKey"] == "key"
+
+    def test_init_mounts_connection_pool(self):
+        client = BunnyClient("key", pool_size=16)
+        adapter = client.session.get_adapter("https://api.bunny.net")
+        assert adapter._pool_maxsize == 16
+
+    def test_init_retries_transient_failures(self):
+        client = BunnyClient("key", max_retries=5)
+        retry = client.session.get_adapter("https://api.bunny.net").max_retries
+        assert retry.total == 5
+        assert set(retry.status_forcelist) == {502, 503, 504}
+        assert "POST" not in retry.allowed_methods
+        assert retry.raise_on_status is False
+
+    def test_init_sets_timeout(self):
+        assert BunnyClient("key").timeout == DEFAULT_TIMEOUT
+        assert BunnyClient("key", timeout=(1.0, 2.0)).timeout == (1.0, 2.0)
+
+    def test_context_manager_closes_session(self):
+        with BunnyClient("key") as client:
+            client.session = Mock()
+            client._cache[("/dnszone", None)] = (0.0, [])
+
+        client.session.close.assert_called_once()
+        assert client._cache == {}
 
 
 class TestHandleResponse:
     """Test response handling and exception raising."""
 
-    def test_200_returns_json(self, mock_client, mock_response):
-        response = mock_response(200, {"data": "test"})
-        result = mock_client._handle_response(response)
-        assert result == {"data": "test"}
-
-    def test_201_returns_json(self, mock_client, mock_response):
-        response = mock_response(201, {"id": 123})
+    @pytest.mark.parametrize("status,json_data", [
+        (200, {"data": "test"}),
+        (201, {"id": 123}),
+    ])
+    def test_success_returns_json(self, mock_client, mock_response, status, json_data):
+        response = mock_response(status, json_data)
         result = mock_client._handle_response(response)
-        assert result == {"id": 123}
+        assert result == json_data
 
-    def test_204_returns_none(self, mock_client, mock_response):
-        response = mock_response(204, None, text="")
-        response.json.side_effect = ValueError("No JSON")
+    def test_204_returns_none(self, mock_client, mock_response_no_json):
+        response = mock_response_no_json(204)
         result = mock_client._handle_response(response)
         assert result is None
 
-    def test_400_raises_validation_error(self, mock_client, mock_response):
-        response = mock_response(400, {"error": "invalid field"})
-        with pytest.raises(BunnyValidationError) as exc:
+    @pytest.mark.parametrize("status,json_data,error", [
+        (400, {"error": "invalid field"}, BunnyValidationError),
+        (401, None, BunnyAuthError),
+        (403, {"message": "forbidden"}, BunnyForbiddenError),
+        (404, {"message": "not found"}, BunnyNotFoundError),
+        (429, None, BunnyRateLimitError),
+        (500, {"error": "server error"}, BunnyAPIError),
+    ])
+    def test_error_status_raises(self, mock_client, mock_response, status, json_data, error):
+        response = mock_response(status, json_data)
+        with pytest.raises(error) as exc:
             mock_client._handle_response(response)
-        assert exc.value.status_code == 400
+        assert exc.value.status_code == status
 
-    def test_401_raises_auth_error(self, mock_client, mock_response):
-        response = mock_response(401, None)
-        with pytest.raises(BunnyAuthError) as exc:
-            mock_client._handle_response(response)
-        assert exc.value.status_code == 401
-        assert "Authentication failed" in str(exc.value)
-
-    def test_403_raises_forbidden_error(self, mock_client, mock_response):
-        response = mock_response(403, {"message": "forbidden"})
-        with pytest.raises(BunnyForbiddenError) as exc:
-            mock_client._handle_response(response)
-        assert exc.value.status_code == 403
-
-    def test_404_raises_not_found_error(self, mock_client, mock_response):
-        response = mock_response(404, {"message": "not found"})
-        with pytest.raises(BunnyNotFoundError) as exc:
-            mock_client._handle_response(response)
-        assert exc.value.status_code == 404
+    def test_401_message(self, mock_client, mock_response):
+        with pytest.raises(BunnyAuthError, match="Authentication failed"):
+            mock_client._handle_response(mock_response(401, None))
 
-    def test_429_raises_rate_limit_error(self, mock_client, mock_response):
-        response = mock_response(429, None)
+    def test_429_parses_retry_after(self, mock_client, mock_response):
+        response = mock_response(429, None, headers={"Retry-After": "2.5"})
         with pytest.raises(BunnyRateLimitError) as exc:
             mock_client._handle_response(response)
-        assert exc.value.status_code == 429
+        assert exc.value.retry_after == 2.5
 
-    def test_500_raises_generic_api_error(self, mock_client, mock_response):
-        response = mock_response(500, {"error": "server error"})
-        with pytest.raises(BunnyAPIError) as exc:
-            mock_client._handle_response(response)
-        assert exc.value.status_code == 500
-
-    def test_handles_invalid_json(self, mock_client, mock_response):
-        response = mock_response(200, None, text="not json")
-        response.json.side_effect = ValueError("Invalid JSON")
+    def test_handles_invalid_json(self, mock_client, mock_response_no_json):
+        response = mock_response_no_json(200, text="not json")
         result = mock_client._handle_response(response)
         assert result is None
 
@@ -108,32 +170,27 @@ class TestHandleResponse:
 class TestRequest:
     """Test the _request method with retry logic."""
 
-    def test_successful_request(self, mock_client, mock_response):
-        response = mock_response(200, {"result": "ok"})
-        mock_client.session.request.return_value = response
+    @pytest.fixture(autouse=True)
+    def sleep_calls(self, monkeypatch):
+        """Record backoff delays instead of sleeping."""
+        calls = []
+        monkeypatch.setattr("bunny_dns.bunny_client.time.sleep", calls.append)
+        return calls
+
+    def test_successful_request(self, mock_client, canned_success_response):
+        mock_client.session.request.return_value = canned_success_response
 
         result = mock_client._request("GET", "/test")
 
-        mock_client.session.request.assert_called_once_with(
-            method="GET",
-            url="https://api.bunny.net/test",
-            params=None,
-            json=None,
-        )
+        assert mock_client.session.request.call_args_list == [EXPECTED_GET]
         assert result == {"result": "ok"}
 
-    def test_passes_params(self, mock_client, mock_response):
-        response = mock_response(200, {"result": "ok"})
-        mock_client.session.request.return_value = response
+    def test_passes_params(self, mock_client, canned_success_response):
+        mock_client.session.request.return_value = canned_success_response
 
         mock_client._request("GET", "/test", params={"key": "value"})
 
-        mock_client.session.request.assert_called_with(
-            method="GET",
-            url="https://api.bunny.net/test",
-            params={"key": "value"},
-            json=None,
-        )
+        assert mock_client.session.request.call_args == EXPECTED_GET_WITH_PARAMS
 
     def test_passes_json_data(self, mock_client, mock_response):
         response = mock_response(201, {"id": 1})
@@ -141,46 +198,39 @@ class TestRequest:
 
         mock_client._request("POST", "/test", json_data={"name": "test"})
 
-        mock_client.session.request.assert_called_with(
-            method="POST",
-            url="https://api.bunny.net/test",
-            params=None,
-            json={"name": "test"},
-        )
+        assert mock_client.session.request.call_args == EXPECTED_POST_WITH_JSON
 
-    def test_retries_on_rate_limit(self, mock_client, mock_response):
+    def test_retries_on_rate_limit(self, mock_client, mock_response, canned_success_response):
         mock_client.max_retries = 2
-        mock_client.retry_delay = 0.01  # Speed up test
+        mock_client.retry_delay = 0  # Only the retry count matters here
 
         rate_limit_response = mock_response(429, None)
-        success_response = mock_response(200, {"result": "ok"})
 
         mock_client.session.request.side_effect = [
             rate_limit_response,
-            success_response,
+            canned_success_response,
         ]
 
-        with patch("time.sleep"):
-            result = mock_client._request("GET", "/test")
+        result = mock_client._request("GET", "/test")
 
         assert result == {"result": "ok"}
         assert mock_client.session.request.call_count == 2
 
-    def test_raises_after_max_retries(self, mock_client, mock_response):
+    def test_raises_after_max_retries(self, mock_client, mock_response, sleep_calls):
         mock_client.max_retries = 2
-        mock_client.retry_delay = 0.01
+        mock_client.retry_delay = 0  # Only the retry count matters here
 
         rate_limit_response = mock_response(429, None)
         mock_client.session.request.return_value = rate_limit_response
 
-        with patch("time.sleep"):
-            with pytest.raises(BunnyRateLimitError):
-                mock_client._request("GET", "/test")
+        with pytest.raises(BunnyRateLimitError):
+            mock_client._request("GET", "/test")
 
-        # Initial attempt + 2 retries = 3 calls
+        # Initial attempt + 2 retries = 3 calls, with a wait between each
         assert mock_client.session.request.call_count == 3
+        assert len(sleep_calls) == 2
 
-    def test_exponential_backoff(self, mock_client, mock_response):
+    def test_exponential_backoff(self, mock_client, mock_response, sleep_calls):
         mock_client.max_retries = 3
         mock_client.retry_delay = 1.0
 
@@ -193,74 +243,174 @@ class TestRequest:
             success_response,
         ]
 
-        sleep_calls = []
-        with patch("time.sleep", side_effect=lambda x: sleep_calls.append(x)):
-            mock_client._request("GET", "/test")
+        mock_client._request("GET", "/test")
 
         # First retry: 1.0 * 2^0 = 1.0
         # Second retry: 1.0 * 2^1 = 2.0
-        assert sleep_calls == [1.0, 2.0]
+        # Each delay gets up to 0.1s of jitter
+        assert len(sleep_calls) == 2
+        assert 1.0 <= sleep_calls[0] <= 1.1
+        assert 2.0 <= sleep_calls[1] <= 2.1
+
+    def test_honors_retry_after_seconds(self, mock_client, mock_response, sleep_calls):
+        rate_limit_response = mock_response(429, None, headers={"Retry-After": "7"})
+        success_response = mock_response(200, {"ok": True})
+        mock_client.session.request.side_effect = [rate_limit_response, success_response]
+
+        mock_client._request("GET", "/test")
+
+        assert len(sleep_calls) == 1
+        assert 7.0 <= sleep_calls[0] <= 7.1
+
+    def test_retry_after_capped(self, mock_client, mock_response, sleep_calls):
+        mock_client.max_retry_delay = 5.0
+        rate_limit_response = mock_response(429, None, headers={"Retry-After": "3600"})
+        success_response = mock_response(200, {"ok": True})
+        mock_client.session.request.side_effect = [rate_limit_response, success_response]
+
+        mock_client._request("GET", "/test")
+
+        assert 5.0 <= sleep_calls[0] <= 5.1
 
 
 class TestHTTPMethods:
     """Test convenience HTTP method wrappers."""
 
-    def test_get_method(self, mock_client, mock_response):
-        response = mock_response(200, {"items": []})
+    @pytest.mark.parametrize("verb,endpoint,kwargs,status,json_data", [
+        ("get", "/dnszone", {"params": {"page": 1}}, 200, {"items": []}),
+        ("post", "/dnszone", {"data": {"Domain": "test.com"}}, 201, {"Id": 123}),
+        ("put", "/dnszone/1/records", {"data": {"Type": 0}}, 200, {"Id": 1}),
+        ("delete", "/dnszone/1", {"params": {"confirm": "true"}}, 204, None),
+    ])
+    def test_http_verb_wraps_request(
+        self, mock_client, mock_response, mock_response_no_json,
+        verb, endpoint, kwargs, status, json_data,
+    ):
+        if json_data is None:
+            response = mock_response_no_json(status)
+        else:
+            response = mock_response(status, json_data)
         mock_client.session.request.return_value = response
 
-        result = mock_client.get("/dnszone", params={"page": 1})
+        result = getattr(mock_client, verb)(endpoint, **kwargs)
 
         mock_client.session.request.assert_called_with(
-            method="GET",
-            url="https://api.bunny.net/dnszone",
-            params={"page": 1},
-            json=None,
+            method=verb.upper(),
+            url=f"https://api.bunny.net{endpoint}",
+            params=kwargs.get("params"),
+            json=kwargs.get("data"),
+            timeout=DEFAULT_TIMEOUT,
         )
-        assert result == {"items": []}
+        assert result == json_data
 
-    def test_post_method(self, mock_client, mock_response):
-        response = mock_response(201, {"Id": 123})
-        mock_client.session.request.return_value = response
 
-        result = mock_client.post("/dnszone", data={"Domain": "test.com"})
+class TestGetCache:
+    """Test the GET response cache and its invalidation."""
 
-        mock_client.session.request.assert_called_with(
-            method="POST",
-            url="https://api.bunny.net/dnszone",
-            params=None,
-            json={"Domain": "test.com"},
-        )
-        assert result == {"Id": 123}
+    def test_repeated_get_served_from_cache(self, mock_client, mock_response):
+        mock_client.session.request.return_value = mock_response(200, {"Items": []})
 
-    def test_put_method(self, mock_client, mock_response):
-        response = mock_response(200, {"Id": 1})
-        mock_client.session.request.return_value = response
+        first = mock_client.get("/dnszone")
+        second = mock_client.get("/dnszone")
 
-        result = mock_client.put("/dnszone/1/records", data={"Type": 0})
+        assert first == second == {"Items": []}
+        assert mock_client.session.request.call_count == 1
 
-        mock_client.session.request.assert_called_with(
-            method="PUT",
-            url="https://api.bunny.net/dnszone/1/records",
-            params=None,
-            json={"Type": 0},
-        )
-        assert result == {"Id": 1}
+    def test_cached_data_is_copied_per_caller(self, mock_client, mock_response):
+        mock_client.session.request.return_value = mock_response(200, {"Items": [1]})
 
-    def test_delete_method(self, mock_client, mock_response):
-        response = mock_response(204, None, text="")
-        response.json.side_effect = ValueError()
-        mock_client.session.request.return_value = response
+        first = mock_client.get("/dnszone")
+        first["Items"].append(2)
+        second = mock_client.get("/dnszone")
+        second["Items"].append(3)
 
-        result = mock_client.delete("/dnszone/1", params={"confirm": "true"})
+        assert mock_client.get("/dnszone") == {"Items": [1]}
+        assert mock_client.session.request.call_count == 1
 
-        mock_client.session.request.assert_called_with(
-            method="DELETE",
-            url="https://api.bunny.net/dnszone/1",
-            params={"confirm": "true"},
-            json=None,
-        )
-        assert result is None
+    def test_params_are_part_of_cache_key(self, mock_client, mock_response):
+        mock_client.session.request.return_value = mock_response(200, {"Items": []})
+
+        mock_client.get("/dnszone", params={"page": 1})
+        mock_client.get("/dnszone", params={"page": 2})
+
+        assert mock_client.session.request.call_count == 2
+
+    def test_expired_entry_refetched(self, mock_client, mock_response):
+        mock_client.session.request.return_value = mock_response(200, {"Items": []})
+
+        with patch("bunny_dns.bunny_client.time.monotonic", side_effect=[0.0, 61.0, 61.0]):
+            mock_client.get("/dnszone")
+            mock_client.get("/dnszone")
+
+        assert mock_client.session.request.call_count == 2
+
+    def test_zero_ttl_disables_cache(self, mock_client, mock_response):
+        mock_client.cache_ttl = 0
+        mock_client.session.request.return_value = mock_response(200, {"Items": []})
+
+        mock_client.get("/dnszone")
+        mock_client.get("/dnszone")
+
+        assert mock_client.session.request.call_count == 2
+
+    def test_mutation_invalidates_parent_and_child_paths(self, mock_client, mock_response):
+        mock_client.session.request.return_value = mock_response(200, {"Id": 1})
+        mock_client.get("/dnszone")
+        mock_client.get("/dnszone/1")
+        mock_client.get("/dnszone/1/records/5")
+        mock_client.get("/pullzone")
+
+        mock_client.put("/dnszone/1/records", data={"Type": 0})
+
+        cached = {key[0] for key in mock_client._cache}
+        assert cached == {"/pullzone"}
+
+    def test_invalidation_during_fetch_skips_store(self, mock_client, mock_response):
+        response = mock_response(200, [])
+
+        def request(**kwargs):
+            # Another thread's write lands while this GET is in flight
+            mock_client.invalidate("/pullzone")
+            return response
+
+        mock_client.session.request.side_effect = request
+
+        mock_client.get("/pullzone")
+
+        assert mock_client._cache == {}
+
+    def test_uncached_get_invalidates_path(self, mock_client, mock_response):
+        mock_client.session.request.return_value = mock_response(200, [])
+        mock_client.get("/pullzone")
+
+        mock_client.get("/pullzone/loadFreeCertificate", params={"hostname": "a"}, cache=False)
+
+        assert mock_client._cache == {}
+
+
+class TestParseRetryAfter:
+    """Test Retry-After header parsing."""
+
+    def test_missing(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("") is None
+
+    def test_seconds(self):
+        assert parse_retry_after("30") == 30.0
+
+    def test_negative_seconds_clamped(self):
+        assert parse_retry_after("-5") == 0.0
+
+    def test_http_date_in_past(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_http_date_in_future(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+        delay = parse_retry_after(format_datetime(retry_at, usegmt=True))
+        assert 100 < delay <= 120
+
+    def test_garbage(self):
+        assert parse_retry_after("soon") is None
 
 
 class TestExceptionAttributes:
@@ -273,8 +423,11 @@ class TestExceptionAttributes:
         assert error.response == {"msg": "fail"}
 
     def test_api_error_inheritance(self):
-        assert issubclass(BunnyAuthError, BunnyAPIError)
-        assert issubclass(BunnyForbiddenError, BunnyAPIError)
-        assert issubclass(BunnyNotFoundError, BunnyAPIError)
-        assert issubclass(BunnyRateLimitError, BunnyAPIError)
-        assert issubclass(BunnyValidationError, BunnyAPIError)
+        subclasses = (
+            BunnyAuthError,
+            BunnyForbiddenError,
+            BunnyNotFoundError,
+            BunnyRateLimitError,
+            BunnyValidationError,
+        )
+        assert all(issubclass(cls, BunnyAPIError) for cls in subclasses)
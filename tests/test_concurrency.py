@@ -0,0 +1,61 @@
+"""
+Tests for concurrency.py - bounded fan-out of API calls.
+"""
+
+import threading
+
+import pytest
+
+from bunny_dns.concurrency import run_concurrently
+
+
+class TestRunConcurrently:
+    """Test run_concurrently helper."""
+
+    def test_preserves_order(self):
+        result = run_concurrently(lambda x: x * 2, [3, 1, 2])
+        assert result == [6, 2, 4]
+
+    def test_empty_items(self):
+        assert run_concurrently(lambda x: x, []) == []
+
+    def test_single_worker_runs_inline(self):
+        threads = []
+        run_concurrently(lambda x: threads.append(threading.current_thread()), [1, 2], max_workers=1)
+        assert threads == [threading.current_thread()] * 2
+
+    def test_calls_overlap(self):
+        # Both calls must be in flight at once for the barrier to release
+        barrier = threading.Barrier(2, timeout=5)
+
+        def func(x):
+            barrier.wait()
+            return x
+
+        result = run_concurrently(func, [1, 2], max_workers=2)
+        assert result == [1, 2]
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_reraises_first_after_all_calls_finish(self, max_workers):
+        calls = []
+
+        def func(x):
+            calls.append(x)
+            if x in (1, 3):
+                raise ValueError(f"boom {x}")
+            return x
+
+        with pytest.raises(ValueError, match="boom 1"):
+            run_concurrently(func, [1, 2, 3], max_workers=max_workers)
+        assert sorted(calls) == [1, 2, 3]
+
+    def test_return_exceptions(self):
+        def check(x):
+            if x == 2:
+                raise ValueError("bad")
+            return x
+
+        result = run_concurrently(check, [1, 2, 3], return_exceptions=True)
+
+        assert result[0] == 1 and result[2] == 3
+        assert isinstance(result[1], ValueError)
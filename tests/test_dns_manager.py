@@ -12,6 +12,7 @@ from bunny_dns.dns_manager import (
     DNSRecord,
     DNSZone,
     DNSManager,
+    RecordType,
 )
 
 
@@ -36,6 +37,10 @@ class TestDNSRecordTypes:
         for name, value in DNS_RECORD_TYPES.items():
             assert DNS_RECORD_TYPES_REVERSE[value] == name
 
+    def test_mapping_matches_enum(self):
+        for t in RecordType:
+            assert DNS_RECORD_TYPES[t.name] == t
+
 
 class TestDNSRecord:
     """Test DNSRecord dataclass."""
@@ -105,6 +110,21 @@ class TestDNSRecord:
         record = DNSRecord.from_api_response(data)
         assert record.type == "A"  # Default fallback
 
+    def test_from_api_response_unused_type_code(self):
+        data = {"Type": 6, "Name": "test", "Value": "test"}
+        record = DNSRecord.from_api_response(data)
+        assert record.type == "A"
+
+    def test_type_canonicalized(self):
+        record = DNSRecord(type="cname", name="www", value="example.com")
+        assert record.type == "CNAME"
+        assert record.to_api_payload()["Type"] == 2
+
+    def test_to_api_payload_unknown_type_raises(self):
+        record = DNSRecord(type="BOGUS", name="test", value="test")
+        with pytest.raises(KeyError):
+            record.to_api_payload()
+
 
 class TestDNSRecordNormalization:
     """Test name normalization - critical for @ vs empty string comparison."""
@@ -182,6 +202,13 @@ class TestDNSRecordMatching:
         assert not r1.matches(r2)
 
 
+    def test_match_key_normalizes(self):
+        r1 = DNSRecord(type="aaaa", name="@", value="2606:50c0:8000::153")
+        r2 = DNSRecord(type="AAAA", name="", value="2606:50c0:8000:0:0:0:0:153")
+        assert r1.match_key() == r2.match_key()
+        assert hash(r1.match_key()) == hash(r2.match_key())
+
+
 class TestDNSRecordNeedsUpdate:
     """Test update detection logic."""
 
@@ -254,11 +281,35 @@ class TestDNSManager:
 
         zones = dns_manager.list_zones()
 
-        dns_manager.client.get.assert_called_once_with("/dnszone")
+        dns_manager.client.get.assert_called_once_with(
+            "/dnszone", params={"page": 1, "perPage": 1000}
+        )
         assert len(zones) == 2
         assert zones[0].domain == "example.com"
         assert zones[1].domain == "test.com"
 
+    def test_list_zones_follows_pages(self, dns_manager):
+        dns_manager.client.get = Mock(side_effect=[
+            {"Items": [{"Id": 1, "Domain": "a.com"}], "HasMoreItems": True},
+            {"Items": [{"Id": 2, "Domain": "b.com"}], "HasMoreItems": False},
+        ])
+
+        zones = dns_manager.list_zones()
+
+        assert [z.domain for z in zones] == ["a.com", "b.com"]
+        dns_manager.client.get.assert_called_with(
+            "/dnszone", params={"page": 2, "perPage": 1000}
+        )
+
+    def test_list_zones_search(self, dns_manager):
+        dns_manager.client.get = Mock(return_value={"Items": []})
+
+        dns_manager.list_zones(search="example.com")
+
+        dns_manager.client.get.assert_called_once_with(
+            "/dnszone", params={"page": 1, "perPage": 1000, "search": "example.com"}
+        )
+
     def test_list_zones_empty(self, dns_manager):
         dns_manager.client.get = Mock(return_value=None)
         zones = dns_manager.list_zones()
@@ -294,6 +345,29 @@ class TestDNSManager:
 
         assert zone is not None
 
+    def test_get_zone_by_domain_uses_listed_records(self, dns_manager, sample_dns_zone_response):
+        # bunny.net embeds records in the zone listing; no second GET needed
+        dns_manager.client.get = Mock(return_value={"Items": [sample_dns_zone_response]})
+
+        zone = dns_manager.get_zone_by_domain("example.com")
+
+        dns_manager.client.get.assert_called_once_with(
+            "/dnszone", params={"page": 1, "perPage": 1000, "search": "example.com"}
+        )
+        assert zone.id == 12345
+        assert len(zone.records) == 3
+
+    def test_get_zone_by_domain_fetches_when_records_missing(self, dns_manager, sample_dns_zone_response):
+        dns_manager.client.get = Mock(side_effect=[
+            {"Items": [{"Id": 12345, "Domain": "example.com"}]},
+            sample_dns_zone_response,
+        ])
+
+        zone = dns_manager.get_zone_by_domain("example.com")
+
+        dns_manager.client.get.assert_called_with("/dnszone/12345")
+        assert len(zone.records) == 3
+
     def test_get_zone_by_domain_not_found(self, dns_manager):
         dns_manager.client.get = Mock(return_value={"Items": []})
 
@@ -351,6 +425,50 @@ class TestDNSManager:
 
         dns_manager.client.delete.assert_called_once_with("/dnszone/12345/records/99")
 
+    def test_repeated_lookups_served_from_client_cache(
+        self, dns_manager, mock_response, sample_dns_zone_response
+    ):
+        dns_manager.client.session.request.return_value = mock_response(
+            200, {"Items": [sample_dns_zone_response]}
+        )
+
+        dns_manager.get_zone_by_domain("example.com")
+        zone = dns_manager.get_zone_by_domain("example.com")
+
+        assert dns_manager.client.session.request.call_count == 1
+        assert zone.id == 12345
+
+    def test_record_change_invalidates_listing(
+        self, dns_manager, mock_response, sample_dns_zone_response
+    ):
+        dns_manager.client.session.request.return_value = mock_response(
+            200, {"Items": [sample_dns_zone_response]}
+        )
+
+        dns_manager.get_zone_by_domain("example.com")
+        dns_manager.delete_record(12345, 1)
+        dns_manager.get_zone_by_domain("example.com")
+
+        methods = [c.kwargs["method"] for c in dns_manager.client.session.request.call_args_list]
+        assert methods == ["GET", "DELETE", "GET"]
+
+    def test_export_all_zones_fetches_only_zones_without_records(self, dns_manager, sample_dns_zone_response):
+        listing = {"Items": [
+            sample_dns_zone_response,
+            {"Id": 2, "Domain": "empty.com", "Records": []},
+        ]}
+        dns_manager.client.get = Mock(side_effect=lambda endpoint, **kwargs: (
+            listing if endpoint == "/dnszone" else {"Id": 2, "Domain": "empty.com", "Records": []}
+        ))
+
+        result = dns_manager.export_all_zones()
+
+        assert list(result) == ["example.com", "empty.com"]
+        assert len(result["example.com"]) == 3
+        assert result["empty.com"] == []
+        fetched = [c.args[0] for c in dns_manager.client.get.call_args_list]
+        assert fetched == ["/dnszone", "/dnszone/2"]
+
 
 class TestDNSManagerSyncZone:
     """Test sync_zone orchestration logic."""
@@ -504,6 +622,97 @@ class TestDNSManagerSyncZone:
         assert len(result["created"]) == 1
         assert len(result["deleted"]) == 1
 
+    def test_sync_dispatches_all_mutations(self, dns_manager):
+        existing_records = [
+            DNSRecord(type="TXT", name="old1", value="remove-me", id=10),
+            DNSRecord(type="TXT", name="old2", value="remove-me", id=11),
+        ]
+        existing_zone = DNSZone(domain="example.com", id=1, records=existing_records)
+        dns_manager.get_zone_by_domain = Mock(return_value=existing_zone)
+        dns_manager.add_record = Mock()
+        dns_manager.delete_record = Mock()
+
+        result = dns_manager.sync_zone(
+            domain="example.com",
+            desired_records=[
+                {"type": "A", "name": f"host{i}", "value": "1.2.3.4"}
+                for i in range(5)
+            ],
+        )
+
+        assert len(result["created"]) == 5
+        assert dns_manager.add_record.call_count == 5
+        added = sorted(c.args[1].name for c in dns_manager.add_record.call_args_list)
+        assert added == [f"host{i}" for i in range(5)]
+        deleted = sorted(c.args[1] for c in dns_manager.delete_record.call_args_list)
+        assert deleted == [10, 11]
+
+    def test_sync_single_worker_applies_in_order(self, mock_client):
+        dns_manager = DNSManager(mock_client, max_workers=1)
+        existing_zone = DNSZone(domain="example.com", id=1, records=[])
+        dns_manager.get_zone_by_domain = Mock(return_value=existing_zone)
+        dns_manager.add_record = Mock()
+
+        dns_manager.sync_zone(
+            domain="example.com",
+            desired_records=[
+                {"type": "A", "name": f"host{i}", "value": "1.2.3.4"}
+                for i in range(5)
+            ],
+        )
+
+        added = [c.args[1].name for c in dns_manager.add_record.call_args_list]
+        assert added == [f"host{i}" for i in range(5)]
+
+    def test_sync_duplicate_current_record_deleted(self, dns_manager):
+        existing_records = [
+            DNSRecord(type="A", name="www", value="1.2.3.4", ttl=300, id=1),
+            DNSRecord(type="A", name="www", value="1.2.3.4", ttl=300, id=2),
+        ]
+        existing_zone = DNSZone(domain="example.com", id=1, records=existing_records)
+        dns_manager.get_zone_by_domain = Mock(return_value=existing_zone)
+        dns_manager.delete_record = Mock()
+
+        result = dns_manager.sync_zone(
+            domain="example.com",
+            desired_records=[{"type": "A", "name": "www", "value": "1.2.3.4", "ttl": 300}],
+        )
+
+        assert len(result["unchanged"]) == 1
+        dns_manager.delete_record.assert_called_once_with(1, 2)
+
+    def test_sync_repeated_desired_record_not_created(self, dns_manager):
+        existing_zone = DNSZone(domain="example.com", id=1, records=[
+            DNSRecord(type="A", name="www", value="1.2.3.4", ttl=300, id=1),
+        ])
+        dns_manager.get_zone_by_domain = Mock(return_value=existing_zone)
+        dns_manager.add_record = Mock()
+        dns_manager.delete_record = Mock()
+
+        rec = {"type": "A", "name": "www", "value": "1.2.3.4", "ttl": 300}
+        result = dns_manager.sync_zone(domain="example.com", desired_records=[rec, dict(rec)])
+
+        assert len(result["unchanged"]) == 2
+        dns_manager.add_record.assert_not_called()
+        dns_manager.delete_record.assert_not_called()
+
+    def test_sync_repeated_desired_record_updated_once(self, dns_manager):
+        existing_zone = DNSZone(domain="example.com", id=1, records=[
+            DNSRecord(type="A", name="www", value="1.2.3.4", ttl=300, id=7),
+        ])
+        dns_manager.get_zone_by_domain = Mock(return_value=existing_zone)
+        dns_manager.update_record = Mock()
+
+        rec = {"type": "A", "name": "www", "value": "1.2.3.4"}
+        dns_manager.sync_zone(
+            domain="example.com",
+            desired_records=[{**rec, "ttl": 600}, {**rec, "ttl": 900}],
+        )
+
+        dns_manager.update_record.assert_called_once()
+        zone_id, record_id, record = dns_manager.update_record.call_args.args
+        assert (zone_id, record_id, record.ttl) == (1, 7, 900)
+
     def test_sync_matches_at_with_empty_string(self, dns_manager):
         """Critical test: Config uses @ but API returns empty string - should match."""
         # API returns record with empty name
@@ -12,6 +12,7 @@ from bunny_dns.edge_rules_manager import (
     TRIGGER_TYPES,
     TRIGGER_TYPES_REVERSE,
     MATCH_TYPES,
+    MATCH_TYPES_REVERSE,
     EdgeRuleTrigger,
     EdgeRuleAction,
     EdgeRule,
@@ -20,6 +21,9 @@ from bunny_dns.edge_rules_manager import (
     parse_rule_from_config,
     group_api_rules_to_config,
     EdgeRulesManager,
+    EdgeRuleActionType,
+    EdgeRuleMatchType,
+    EdgeRuleTriggerType,
 )
 
 
@@ -80,6 +84,18 @@ class TestMatchTypes:
         assert MATCH_TYPES["all"] == 1
         assert MATCH_TYPES["none"] == 2
 
+    def test_reverse_mapping(self):
+        for name, value in MATCH_TYPES.items():
+            assert MATCH_TYPES_REVERSE[value] == name
+
+    def test_tables_match_enums(self):
+        for enum_cls, table in [
+            (EdgeRuleActionType, ACTION_TYPES),
+            (EdgeRuleTriggerType, TRIGGER_TYPES),
+            (EdgeRuleMatchType, MATCH_TYPES),
+        ]:
+            assert table == {t.name: t.value for t in enum_cls}
+
 
 class TestEdgeRuleTrigger:
     """Test EdgeRuleTrigger dataclass."""
@@ -117,6 +133,30 @@ class TestEdgeRuleTrigger:
 
         assert payload["PatternMatchingType"] == 1
 
+    def test_payload_is_a_fresh_copy(self):
+        trigger = EdgeRuleTrigger(type="url", patterns=["/*"])
+        first = trigger.to_api_payload()
+        first["PatternMatches"].append("/admin/*")
+        trigger.parameter = "X-Edited"
+
+        second = trigger.to_api_payload()
+
+        assert second is not first
+        assert second["PatternMatches"] == ["/*"]
+        assert second["Parameter1"] == "X-Edited"
+
+    def test_payload_follows_trigger_edits_across_split_rules(self):
+        rules = parse_rule_from_config({
+            "triggers": [{"type": "url", "patterns": ["/*"]}],
+            "actions": [{"type": "force_ssl"}, {"type": "block"}],
+        })
+        rules[0].to_api_payload()
+        rules[0].triggers.append(EdgeRuleTrigger(type="country_code", patterns=["DE"]))
+
+        first, second = (r.to_api_payload()["Triggers"] for r in rules)
+        assert first == second
+        assert [t["Type"] for t in first] == [0, 4]
+
     def test_from_api_response(self, sample_edge_rule_response):
         trigger_data = sample_edge_rule_response["Triggers"][0]
         trigger = EdgeRuleTrigger.from_api_response(trigger_data)
@@ -464,6 +504,17 @@ class TestEdgeRulesManager:
 
         assert rules == []
 
+    def test_iter_rules_is_lazy(self, er_manager, sample_edge_rule_response):
+        er_manager.client.get = Mock(return_value={
+            "EdgeRules": [sample_edge_rule_response, sample_edge_rule_response],
+        })
+
+        rules = er_manager.iter_rules(67890)
+
+        assert not isinstance(rules, list)
+        assert next(rules).guid == "abc-123-def"
+        assert len(list(rules)) == 1
+
     def test_add_or_update_rule(self, er_manager):
         er_manager.client.post = Mock(return_value={"Guid": "new-guid"})
 
@@ -484,15 +535,24 @@ class TestEdgeRulesManager:
         er_manager.client.delete.assert_called_once_with("/pullzone/67890/edgerules/abc-123")
 
     def test_delete_all_rules(self, er_manager, sample_edge_rule_response):
-        er_manager.get_rules = Mock(return_value=[
+        er_manager.iter_rules = Mock(return_value=iter([
             EdgeRule.from_api_response(sample_edge_rule_response),
-        ])
+        ]))
         er_manager.delete_rule = Mock()
 
         er_manager.delete_all_rules(67890)
 
         er_manager.delete_rule.assert_called_once_with(67890, "abc-123-def")
 
+    def test_delete_all_rules_uses_given_rules(self, er_manager):
+        er_manager.iter_rules = Mock()
+        er_manager.delete_rule = Mock()
+
+        er_manager.delete_all_rules(67890, [EdgeRule(description="R", guid="g-1")])
+
+        er_manager.iter_rules.assert_not_called()
+        er_manager.delete_rule.assert_called_once_with(67890, "g-1")
+
 
 class TestEdgeRulesManagerSyncRules:
     """Test sync_rules orchestration logic."""
@@ -532,6 +592,18 @@ class TestEdgeRulesManagerSyncRules:
         assert len(result["created"]) == 0
         er_manager.delete_rule.assert_called_once()
 
+    def test_sync_deletes_all_existing_rules(self, er_manager):
+        existing = [EdgeRule(description=f"Rule {i}", guid=f"guid-{i}") for i in range(5)]
+        existing.append(EdgeRule(description="No guid"))
+        er_manager.get_rules = Mock(return_value=existing)
+        er_manager.delete_rule = Mock()
+
+        result = er_manager.sync_rules(zone_id=67890, rule_configs=[])
+
+        assert len(result["deleted"]) == 6
+        deleted = sorted(c.args[1] for c in er_manager.delete_rule.call_args_list)
+        assert deleted == [f"guid-{i}" for i in range(5)]
+
     def test_sync_creates_from_empty(self, er_manager):
         er_manager.get_rules = Mock(return_value=[])
         er_manager.add_or_update_rule = Mock(return_value={})
@@ -0,0 +1,52 @@
+"""
+Tests for jsonlib.py - JSON helpers with optional orjson acceleration.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from bunny_dns import jsonlib
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request):
+    """Run each test against orjson (when installed) and the stdlib fallback."""
+    if request.param == "orjson":
+        if jsonlib.orjson is None:
+            pytest.skip("orjson not installed")
+        yield
+    else:
+        with patch.object(jsonlib, "orjson", None):
+            yield
+
+
+class TestLoads:
+    """Test jsonlib.loads."""
+
+    def test_loads_bytes(self, backend):
+        assert jsonlib.loads(b'{"Items": [1, 2]}') == {"Items": [1, 2]}
+
+    def test_loads_str(self, backend):
+        assert jsonlib.loads('{"a": "b"}') == {"a": "b"}
+
+    def test_invalid_raises_value_error(self, backend):
+        with pytest.raises(ValueError):
+            jsonlib.loads(b"not json")
+
+
+class TestDumps:
+    """Test jsonlib.dumps."""
+
+    def test_compact(self, backend):
+        assert jsonlib.dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+
+    def test_indent_matches_stdlib(self, backend):
+        data = {"domains": {"example.com": {"dns_records": [], "name": "é"}}}
+        assert jsonlib.dumps(data, indent=True) == json.dumps(data, indent=2, ensure_ascii=False)
+
+    def test_ensure_ascii_matches_stdlib_default(self, backend):
+        data = {"name": "é", "records": [1, 2]}
+        assert jsonlib.dumps(data, indent=True, ensure_ascii=True) == json.dumps(data, indent=2)
+        assert jsonlib.dumps(data, ensure_ascii=True) == '{"name":"\\u00e9","records":[1,2]}'
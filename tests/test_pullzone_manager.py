@@ -2,10 +2,13 @@
 Tests for pullzone_manager.py - Pull Zone management.
 """
 
-from unittest.mock import Mock, MagicMock
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, MagicMock, patch
 
 import pytest
 
+from bunny_dns.bunny_client import BunnyAPIError, BunnyClient, BunnyValidationError
 from bunny_dns.pullzone_manager import (
     PULLZONE_TYPES,
     PULLZONE_TYPES_REVERSE,
@@ -123,6 +126,14 @@ class TestPullZone:
 
         assert payload["Type"] == 1
 
+    def test_matches_ignores_unset_origin(self):
+        zone = PullZone(name="z", origin_url="https://o.example.com", enable_geo_zone_af=False)
+
+        assert zone.matches(PullZone(name="z", enable_geo_zone_af=False))
+        assert not zone.matches(PullZone(name="z", origin_url="https://new.example.com", enable_geo_zone_af=False))
+        assert not zone.matches(PullZone(name="z"))
+        assert not zone.matches(PullZone(name="z", type=1, enable_geo_zone_af=False))
+
     def test_to_api_payload_region_flags(self):
         zone = PullZone(
             name="my-cdn",
@@ -192,6 +203,16 @@ class TestPullZoneManager:
 
         assert zone is not None
 
+    def test_get_zone_by_name_prefers_first_match(self, pz_manager):
+        pz_manager.client.get = Mock(return_value=[
+            {"Id": 1, "Name": "My-CDN", "Hostnames": []},
+            {"Id": 2, "Name": "my-cdn", "Hostnames": []},
+        ])
+
+        zone = pz_manager.get_zone_by_name("MY-CDN")
+
+        assert zone.id == 1
+
     def test_get_zone_by_name_not_found(self, pz_manager):
         pz_manager.client.get = Mock(return_value=[])
 
@@ -199,6 +220,41 @@ class TestPullZoneManager:
 
         assert zone is None
 
+    def test_zone_lookups_reuse_listing(self, pz_manager, mock_response):
+        pz_manager.client.session.request.return_value = mock_response(200, [
+            {"Id": 1, "Name": "zone1", "Hostnames": []},
+            {"Id": 2, "Name": "zone2", "Hostnames": []},
+        ])
+
+        assert pz_manager.get_zone_by_name("zone1").id == 1
+        assert pz_manager.get_zone_by_name("zone2").id == 2
+        assert pz_manager.get_zones_for_domain("example.com") == []
+
+        assert pz_manager.client.session.request.call_count == 1
+
+    def test_mutation_invalidates_zone_listing(self, pz_manager, mock_response):
+        request = pz_manager.client.session.request
+        request.return_value = mock_response(200, [{"Id": 1, "Name": "zone1", "Hostnames": []}])
+
+        pz_manager.get_zone_by_name("zone1")
+        pz_manager.delete_zone(1)
+        request.return_value = mock_response(200, [])
+
+        assert pz_manager.get_zone_by_name("zone1") is None
+        assert request.call_count == 3
+
+    def test_edge_rule_change_invalidates_listing(self, pz_manager, mock_response):
+        request = pz_manager.client.session.request
+        request.return_value = mock_response(200, [{"Id": 1, "Name": "zone1", "EdgeRules": []}])
+
+        pz_manager.get_zone_by_name("zone1")
+        pz_manager.client.post("/pullzone/1/edgerules/addOrUpdate", {"ActionType": 4})
+        request.return_value = mock_response(
+            200, [{"Id": 1, "Name": "zone1", "EdgeRules": [{"Guid": "abc"}]}]
+        )
+
+        assert pz_manager.get_zone_by_name("zone1").edge_rules == [{"Guid": "abc"}]
+
     def test_create_zone(self, pz_manager, sample_pullzone_response):
         pz_manager.client.post = Mock(return_value=sample_pullzone_response)
 
@@ -255,6 +311,7 @@ class TestPullZoneManager:
         pz_manager.client.get.assert_called_once_with(
             "/pullzone/loadFreeCertificate",
             params={"hostname": "cdn.example.com"},
+            cache=False,
         )
 
     def test_set_force_ssl(self, pz_manager):
@@ -267,6 +324,119 @@ class TestPullZoneManager:
             {"Hostname": "cdn.example.com", "ForceSSL": True},
         )
 
+    def test_load_free_certificate_retries_server_errors(self, pz_manager):
+        pz_manager.client.get = Mock(side_effect=[
+            BunnyAPIError("Internal error", status_code=500),
+            None,
+        ])
+
+        with patch("time.sleep") as mock_sleep:
+            pz_manager.load_free_certificate("cdn.example.com")
+
+        assert pz_manager.client.get.call_count == 2
+        mock_sleep.assert_called_once()
+
+    def test_set_force_ssl_does_not_retry_client_errors(self, pz_manager):
+        pz_manager.client.post = Mock(side_effect=BunnyValidationError("Bad", status_code=400))
+
+        with patch("time.sleep") as mock_sleep:
+            with pytest.raises(BunnyValidationError):
+                pz_manager.set_force_ssl(67890, "cdn.example.com")
+
+        pz_manager.client.post.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_load_free_certificate_gives_up_after_max_retries(self, pz_manager):
+        pz_manager.client.get = Mock(side_effect=BunnyAPIError("Down", status_code=500))
+
+        with patch("time.sleep"):
+            with pytest.raises(BunnyAPIError):
+                pz_manager.load_free_certificate("cdn.example.com")
+
+        assert pz_manager.client.get.call_count == pz_manager.client.max_retries + 1
+
+
+    def test_load_free_certificate_leaves_gateway_errors_to_transport(self, pz_manager):
+        pz_manager.client.get = Mock(side_effect=BunnyAPIError("Bad gateway", status_code=502))
+
+        with patch("time.sleep") as mock_sleep:
+            with pytest.raises(BunnyAPIError):
+                pz_manager.load_free_certificate("cdn.example.com")
+
+        pz_manager.client.get.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_set_force_ssl_retries_gateway_errors(self, pz_manager):
+        pz_manager.client.post = Mock(side_effect=[
+            BunnyAPIError("Bad gateway", status_code=502),
+            None,
+        ])
+
+        with patch("time.sleep"):
+            pz_manager.set_force_ssl(67890, "cdn.example.com")
+
+        assert pz_manager.client.post.call_count == 2
+
+
+class TestPullZoneManagerRetryAttempts:
+    """Count the requests that actually reach the server when it keeps failing."""
+
+    @pytest.fixture
+    def server(self):
+        """Local HTTP server answering every request with the status in server.status."""
+        hits = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self):
+                hits.append(self.command)
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                self.send_response(httpd.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            do_GET = do_POST = _reply
+
+            def log_message(self, *args):
+                pass
+
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        httpd.status = 503
+        httpd.hits = hits
+        thread = threading.Thread(
+            target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+        thread.start()
+        yield httpd
+        httpd.shutdown()
+        httpd.server_close()
+
+    @pytest.fixture
+    def pz_manager(self, server, monkeypatch):
+        monkeypatch.setattr("time.sleep", lambda seconds: None)
+        client = BunnyClient("key", max_retries=2)
+        # Route plain HTTP through the same retrying adapter as the real API
+        client.session.mount("http://", client.session.get_adapter(client.BASE_URL))
+        client.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+        yield PullZoneManager(client)
+        client.close()
+
+    @pytest.mark.parametrize("status,call,attempts", [
+        # Gateway errors on GET are retried only by the transport
+        pytest.param(503, lambda m: m.load_free_certificate("cdn.example.com"), 3, id="get-503"),
+        # 500 is retried only by the manager
+        pytest.param(500, lambda m: m.load_free_certificate("cdn.example.com"), 3, id="get-500"),
+        # POST is never retried by the transport
+        pytest.param(503, lambda m: m.set_force_ssl(1, "cdn.example.com"), 3, id="post-503"),
+    ])
+    def test_attempts_per_call(self, server, pz_manager, status, call, attempts):
+        server.status = status
+
+        with pytest.raises(BunnyAPIError):
+            call(pz_manager)
+
+        assert len(server.hits) == attempts
+
 
 class TestPullZoneManagerSyncZone:
     """Test sync_zone orchestration logic."""
@@ -297,6 +467,7 @@ class TestPullZoneManagerSyncZone:
         )
 
         assert result["created"] is True
+        assert result["zone_id"] == 67890
         pz_manager.create_zone.assert_called_once()
 
     def test_sync_updates_origin_url(self, pz_manager, sample_pullzone_response):
@@ -362,6 +533,22 @@ class TestPullZoneManagerSyncZone:
         assert result["updated"] is True
         assert any("regions" in c.lower() for c in result["changes"])
 
+    def test_sync_region_change_message(self, pz_manager, sample_pullzone_response):
+        existing_zone = PullZone.from_api_response(sample_pullzone_response)
+        pz_manager.get_zone_by_name = Mock(return_value=existing_zone)
+        pz_manager.update_zone = Mock(return_value=existing_zone)
+        pz_manager.remove_hostname = Mock()
+
+        result = pz_manager.sync_zone(
+            name="my-cdn",
+            config={"enabled_regions": ["eu", "us", "af"]},
+        )
+
+        assert "Updating regions: ASIA: True -> False, AF: False -> True" in result["changes"]
+        desired = pz_manager.update_zone.call_args[0][1]
+        assert desired.enable_geo_zone_af is True
+        assert desired.enable_geo_zone_asia is False
+
     def test_sync_adds_hostname(self, pz_manager, sample_pullzone_response):
         existing_zone = PullZone.from_api_response(sample_pullzone_response)
         # Has cdn.example.com, adding new.example.com
@@ -486,6 +673,131 @@ class TestPullZoneManagerSyncZone:
         assert call_args.enable_geo_zone_sa is True
         assert call_args.enable_geo_zone_af is True
 
+    def test_sync_adds_many_hostnames_with_force_ssl(self, pz_manager, sample_pullzone_response):
+        existing_zone = PullZone.from_api_response(sample_pullzone_response)
+        existing_zone.hostnames = [h for h in existing_zone.hostnames if h.is_system_hostname]
+        pz_manager.get_zone_by_name = Mock(return_value=existing_zone)
+        pz_manager.add_hostname = Mock()
+        pz_manager.load_free_certificate = Mock()
+        pz_manager.set_force_ssl = Mock()
+        hostnames = [f"h{i}.example.com" for i in range(6)]
+
+        result = pz_manager.sync_zone(
+            name="my-cdn",
+            config={
+                "hostnames": hostnames,
+                "force_ssl": True,
+                "enabled_regions": ["EU", "US", "ASIA"],  # Match fixture
+            },
+        )
+
+        assert sorted(result["hostnames_added"]) == hostnames
+        assert sorted(result["certificates_loaded"]) == hostnames
+        assert pz_manager.set_force_ssl.call_count == 6
+        # Each hostname's notes stay grouped together
+        for i, change in enumerate(result["changes"]):
+            if change.startswith("Adding hostname: "):
+                hostname = change.removeprefix("Adding hostname: ")
+                assert result["changes"][i + 1] == f"Enabled Force SSL for {hostname}"
+
+    def test_sync_existing_hostnames_fan_out(self, pz_manager, sample_pullzone_response):
+        existing_zone = PullZone.from_api_response(sample_pullzone_response)
+        existing_zone.hostnames = [
+            Hostname(id=i, value=f"h{i}.example.com", force_ssl=False, has_certificate=False)
+            for i in range(4)
+        ] + [Hostname(id=9, value="old.example.com")]
+        pz_manager.get_zone_by_name = Mock(return_value=existing_zone)
+
+        def load_certificate(hostname):
+            if hostname == "h2.example.com":
+                raise Exception("boom")
+
+        pz_manager.load_free_certificate = Mock(side_effect=load_certificate)
+        pz_manager.set_force_ssl = Mock()
+        pz_manager.remove_hostname = Mock()
+        hostnames = [f"h{i}.example.com" for i in range(4)]
+
+        result = pz_manager.sync_zone(
+            name="my-cdn",
+            config={
+                "hostnames": hostnames,
+                "force_ssl": True,
+                "enabled_regions": ["EU", "US", "ASIA"],  # Match fixture
+            },
+        )
+
+        assert sorted(result["certificates_loaded"]) == ["h0.example.com", "h1.example.com", "h3.example.com"]
+        i = result["changes"].index("Loading certificate for h2.example.com")
+        assert result["changes"][i + 1] == "Warning: Could not load certificate for h2.example.com: boom"
+        assert pz_manager.set_force_ssl.call_count == 4
+        pz_manager.remove_hostname.assert_called_once_with(existing_zone.id, "old.example.com")
+        assert result["hostnames_removed"] == ["old.example.com"]
+
+    def test_sync_defers_certificates_until_flush(self, pz_manager, sample_pullzone_response):
+        existing_zone = PullZone.from_api_response(sample_pullzone_response)
+        existing_zone.hostnames = [h for h in existing_zone.hostnames if h.is_system_hostname]
+        pz_manager.get_zone_by_name = Mock(return_value=existing_zone)
+        pz_manager.add_hostname = Mock()
+
+        def load_certificate(hostname):
+            if hostname == "b.example.com":
+                raise Exception("Not ready")
+
+        pz_manager.load_free_certificate = Mock(side_effect=load_certificate)
+        pz_manager.set_force_ssl = Mock()
+        config = {
+            "force_ssl": True,
+            "enabled_regions": ["EU", "US", "ASIA"],  # Match fixture
+        }
+
+        first = pz_manager.sync_zone(
+            name="my-cdn", config={**config, "hostnames": ["a.example.com"]}, defer_certificates=True
+        )
+        second = pz_manager.sync_zone(
+            name="my-cdn", config={**config, "hostnames": ["b.example.com"]}, defer_certificates=True
+        )
+
+        assert pz_manager.add_hostname.call_count == 2
+        pz_manager.load_free_certificate.assert_not_called()
+        assert first["changes"] == ["Adding hostname: a.example.com"]
+
+        pz_manager.flush_pending_certificates()
+
+        assert first["certificates_loaded"] == ["a.example.com"]
+        assert first["changes"][-1] == "Enabled Force SSL for a.example.com"
+        assert second["certificates_loaded"] == []
+        assert "Warning: Could not load certificate for b.example.com: Not ready" in second["changes"]
+        assert pz_manager._pending_certificates == []
+
+    def test_sync_failed_add_still_queues_added_hostnames(self, pz_manager, sample_pullzone_response):
+        existing_zone = PullZone.from_api_response(sample_pullzone_response)
+        existing_zone.hostnames = [h for h in existing_zone.hostnames if h.is_system_hostname]
+        pz_manager.get_zone_by_name = Mock(return_value=existing_zone)
+
+        def add_hostname(zone_id, hostname):
+            if hostname == "b.example.com":
+                raise BunnyAPIError("Hostname taken", status_code=400)
+
+        pz_manager.add_hostname = Mock(side_effect=add_hostname)
+        pz_manager.load_free_certificate = Mock()
+        pz_manager.set_force_ssl = Mock()
+
+        with pytest.raises(BunnyAPIError):
+            pz_manager.sync_zone(
+                name="my-cdn",
+                config={
+                    "hostnames": ["a.example.com", "b.example.com"],
+                    "force_ssl": True,
+                    "enabled_regions": ["EU", "US", "ASIA"],  # Match fixture
+                },
+                defer_certificates=True,
+            )
+
+        assert pz_manager.add_hostname.call_count == 2
+        pz_manager.flush_pending_certificates()
+        pz_manager.load_free_certificate.assert_called_once_with("a.example.com")
+        pz_manager.set_force_ssl.assert_called_once_with(existing_zone.id, "a.example.com", force=True)
+
     def test_sync_certificate_error_continues(self, pz_manager, sample_pullzone_response):
         existing_zone = PullZone.from_api_response(sample_pullzone_response)
         existing_zone.hostnames = [h for h in existing_zone.hostnames if h.is_system_hostname]
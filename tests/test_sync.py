@@ -4,12 +4,15 @@ Tests for sync.py - Main orchestrator.
 
 import json
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch
 
 import pytest
 
-from bunny_dns.sync import BunnySync, print_results
+from bunny_dns.bunny_client import BunnyAPIError
+from bunny_dns.pullzone_manager import PullZone, PullZoneManager
+from bunny_dns.sync import SYNC_CACHE_TTL, BunnySync, print_results
 
 
 class TestBunnySyncInit:
@@ -19,11 +22,19 @@ class TestBunnySyncInit:
         with patch("bunny_dns.sync.BunnyClient") as mock_client_class:
             sync = BunnySync("test-api-key")
 
-            mock_client_class.assert_called_once_with("test-api-key")
+            mock_client_class.assert_called_once_with("test-api-key", cache_ttl=SYNC_CACHE_TTL)
             assert sync.dns_manager is not None
             assert sync.pullzone_manager is not None
             assert sync.edge_rules_manager is not None
 
+    def test_context_manager_closes_client(self):
+        with patch("bunny_dns.sync.BunnyClient") as mock_client_class:
+            with BunnySync("test-api-key") as sync:
+                pass
+
+            assert sync.client is mock_client_class.return_value
+            mock_client_class.return_value.close.assert_called_once()
+
 
 class TestLoadConfig:
     """Test configuration loading."""
@@ -44,6 +55,14 @@ class TestLoadConfig:
         result = bunny_sync.load_config(json_string)
         assert result == short_config
 
+    def test_load_config_json_string_skips_filesystem(self, bunny_sync, sample_config):
+        # Long inline JSON used to hit Path.exists (and could raise on some platforms)
+        with patch.object(Path, "exists") as mock_exists:
+            result = bunny_sync.load_config(json.dumps(sample_config))
+
+        mock_exists.assert_not_called()
+        assert result == sample_config
+
     def test_load_config_from_file(self, bunny_sync, sample_config):
         with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
             json.dump(sample_config, f)
@@ -181,6 +200,8 @@ class TestSync:
         bunny_sync.pullzone_manager.sync_zone.assert_called_once()
         assert result["summary"]["pull_zones_created"] == 1
         assert result["summary"]["hostnames_added"] == 1
+        assert bunny_sync.pullzone_manager.sync_zone.call_args.kwargs["defer_certificates"] is True
+        bunny_sync.pullzone_manager.flush_pending_certificates.assert_called_once_with()
 
     def test_sync_edge_rules(self, bunny_sync, sample_config):
         bunny_sync.dns_manager.sync_zone.return_value = {
@@ -214,6 +235,102 @@ class TestSync:
         )
         assert result["summary"]["edge_rules_created"] == 1
 
+    def test_sync_edge_rules_uses_zone_id_from_result(self, bunny_sync, sample_config):
+        bunny_sync.dns_manager.sync_zone.return_value = {"zone": "example.com"}
+        bunny_sync.pullzone_manager.sync_zone.return_value = {
+            "zone": "my-cdn",
+            "zone_id": 4242,
+            "changes": [],
+        }
+        bunny_sync.edge_rules_manager.sync_rules.return_value = {"created": [], "deleted": []}
+
+        bunny_sync.sync(sample_config)
+
+        bunny_sync.pullzone_manager.get_zone_by_name.assert_not_called()
+        assert bunny_sync.edge_rules_manager.sync_rules.call_args.kwargs["zone_id"] == 4242
+
+    def test_sync_many_domains_keeps_config_order(self, bunny_sync):
+        config = {
+            "domains": {
+                f"d{i}.com": {
+                    "dns_records": [{"type": "A", "name": "@", "value": "1.2.3.4"}],
+                    "pull_zones": {f"zone-{i}": {}},
+                }
+                for i in range(5)
+            }
+        }
+        bunny_sync.dns_manager.sync_zone.side_effect = lambda domain, **kwargs: {
+            "zone": domain, "created": [1], "updated": [], "deleted": [],
+        }
+        bunny_sync.pullzone_manager.sync_zone.side_effect = lambda name, **kwargs: {
+            "zone": name, "created": True, "hostnames_added": [], "changes": [],
+        }
+
+        result = bunny_sync.sync(config)
+
+        assert [z["zone"] for z in result["dns_zones"]] == [f"d{i}.com" for i in range(5)]
+        assert [(z["domain"], z["zone"]) for z in result["pull_zones"]] == [
+            (f"d{i}.com", f"zone-{i}") for i in range(5)
+        ]
+        assert result["summary"]["dns_records_created"] == 5
+        assert result["summary"]["pull_zones_created"] == 5
+
+    def test_sync_skips_domains_without_work(self, bunny_sync):
+        config = {
+            "domains": {
+                "empty.com": {"dns_records": [], "pull_zones": {}},
+                "bare.com": {},
+                "real.com": {"dns_records": [{"type": "A", "name": "@", "value": "1.2.3.4"}]},
+            }
+        }
+        bunny_sync.dns_manager.sync_zone.return_value = {"zone": "real.com", "created": []}
+
+        with patch.object(bunny_sync, "_sync_domain", wraps=bunny_sync._sync_domain) as sync_domain:
+            result = bunny_sync.sync(config)
+
+        assert [call.args[0][0] for call in sync_domain.call_args_list] == ["real.com"]
+        assert [z["zone"] for z in result["dns_zones"]] == ["real.com"]
+
+    def test_sync_failure_still_secures_other_domains(self, bunny_sync, mock_client):
+        config = {
+            "domains": {
+                "a.com": {"pull_zones": {"zone-a": {"hostnames": ["cdn.a.com"]}}},
+                "b.com": {"dns_records": [{"type": "A", "name": "@", "value": "1.2.3.4"}]},
+            }
+        }
+        pz_manager = PullZoneManager(mock_client)
+        pz_manager.get_zone_by_name = Mock(return_value=None)
+        pz_manager.create_zone = Mock(return_value=PullZone(id=1, name="zone-a"))
+        pz_manager.add_hostname = Mock()
+        pz_manager.load_free_certificate = Mock()
+        bunny_sync.pullzone_manager = pz_manager
+        bunny_sync.dns_manager.sync_zone.side_effect = BunnyAPIError("boom", status_code=500)
+        # Serial, so a.com is synced before b.com fails
+        bunny_sync.max_workers = 1
+
+        with pytest.raises(BunnyAPIError, match="boom"):
+            bunny_sync.sync(config)
+
+        pz_manager.add_hostname.assert_called_once_with(1, "cdn.a.com")
+        pz_manager.load_free_certificate.assert_called_once_with("cdn.a.com")
+        assert pz_manager._pending_certificates == []
+
+    def test_sync_failure_stops_starting_domains(self, bunny_sync):
+        config = {
+            "domains": {
+                f"d{i}.com": {"dns_records": [{"type": "A", "name": "@", "value": "1.2.3.4"}]}
+                for i in range(3)
+            }
+        }
+        bunny_sync.max_workers = 1
+        bunny_sync.dns_manager.sync_zone.side_effect = BunnyAPIError("boom", status_code=500)
+
+        with pytest.raises(BunnyAPIError, match="boom"):
+            bunny_sync.sync(config)
+
+        bunny_sync.dns_manager.sync_zone.assert_called_once()
+        assert bunny_sync.dns_manager.sync_zone.call_args.kwargs["domain"] == "d0.com"
+
     def test_sync_domain_filter(self, bunny_sync, sample_config):
         bunny_sync.dns_manager.sync_zone.return_value = {
             "zone": "example.com",
@@ -396,11 +513,46 @@ class TestSyncPullzonesOnly:
         result = bunny_sync.sync_pullzones_only(sample_config)
 
         bunny_sync.pullzone_manager.sync_zone.assert_called_once()
+        bunny_sync.pullzone_manager.flush_pending_certificates.assert_called_once_with()
         bunny_sync.dns_manager.sync_zone.assert_not_called()
         bunny_sync.edge_rules_manager.sync_rules.assert_not_called()
         assert "pull_zones" in result
         assert "dns_zones" not in result
 
+    def test_sync_pullzones_only_keeps_config_order(self, bunny_sync):
+        config = {
+            "domains": {
+                "a.com": {"pull_zones": {"zone-1": {}, "zone-2": {}}},
+                "b.com": {"pull_zones": {"zone-3": {}}},
+            }
+        }
+        bunny_sync.pullzone_manager.sync_zone.side_effect = (
+            lambda name, **kwargs: {"zone": name, "changes": []}
+        )
+
+        result = bunny_sync.sync_pullzones_only(config)
+
+        assert [(r["domain"], r["zone"]) for r in result["pull_zones"]] == [
+            ("a.com", "zone-1"),
+            ("a.com", "zone-2"),
+            ("b.com", "zone-3"),
+        ]
+
+    def test_sync_pullzones_only_overlaps_zones_of_one_domain(self, bunny_sync):
+        config = {"domains": {"a.com": {"pull_zones": {"zone-1": {}, "zone-2": {}}}}}
+        # Both zones must be in flight at once for the barrier to release
+        barrier = threading.Barrier(2, timeout=5)
+
+        def sync_zone(name, **kwargs):
+            barrier.wait()
+            return {"zone": name, "changes": []}
+
+        bunny_sync.pullzone_manager.sync_zone.side_effect = sync_zone
+
+        result = bunny_sync.sync_pullzones_only(config)
+
+        assert [r["zone"] for r in result["pull_zones"]] == ["zone-1", "zone-2"]
+
     def test_sync_pullzones_only_domain_filter(self, bunny_sync, sample_config):
         bunny_sync.pullzone_manager.sync_zone.return_value = {
             "zone": "my-cdn",
@@ -429,6 +581,16 @@ class TestPrintResults:
         captured = capsys.readouterr()
         assert "DRY RUN" in captured.out
 
+    def test_print_writes_report_once(self):
+        results = {"dry_run": True, "domain_filter": "example.com"}
+        with patch("sys.stdout") as mock_stdout:
+            print_results(results)
+
+        mock_stdout.write.assert_called_once_with(
+            "=== DRY RUN MODE (no changes made) ===\n\n"
+            "=== Syncing domain: example.com ===\n\n"
+        )
+
     def test_print_domain_filter(self, capsys):
         results = {"domain_filter": "example.com", "dns_zones": [], "pull_zones": []}
         print_results(results)
@@ -728,6 +890,25 @@ class TestPull:
 
         assert "my-cdn" in result["domains"]["example.com"]["pull_zones"]
 
+    def test_pull_all_prefers_most_specific_domain(self, bunny_sync):
+        bunny_sync.dns_manager.export_all_zones.return_value = {
+            "example.com": [],
+            "Sub.Example.com": [],
+        }
+
+        from bunny_dns.pullzone_manager import PullZone, Hostname
+        pz = PullZone(
+            name="my-cdn", id=1,
+            hostnames=[Hostname(value="CDN.sub.example.com", is_system_hostname=False)],
+        )
+        bunny_sync.pullzone_manager.list_zones.return_value = [pz]
+        bunny_sync.edge_rules_manager.export_rules.return_value = []
+
+        result = bunny_sync.pull(pull_all=True)
+
+        assert "my-cdn" in result["domains"]["Sub.Example.com"]["pull_zones"]
+        assert result["domains"]["example.com"]["pull_zones"] == {}
+
     def test_pull_all_unmatched_pullzone_warns(self, bunny_sync, capsys):
         bunny_sync.dns_manager.export_all_zones.return_value = {
             "example.com": [],